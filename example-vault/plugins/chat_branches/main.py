@@ -326,11 +326,14 @@ class Plugin(PluginBase):
             
             self.logger.info(f"Created branch '{branch_id}' from message '{message_id}' for chat '{chat_id}'")
             
-            # Debug: dump complete branch state
+            # Debug: dump complete branch state (lazy, so nothing is serialized unless DEBUG is enabled)
             import json
-            self.logger.info(f"BRANCH STATE AFTER CREATE:\n{json.dumps(data.get('branches', {}), indent=2, default=str)}")
+            self.logger.opt(lazy=True).debug(
+                "BRANCH STATE AFTER CREATE:\n{}",
+                lambda: json.dumps(data.get("branches", {}), indent=2, default=str),
+            )
             for msg in data.get("messages", []):
-                self.logger.info(f"  MSG {msg.get('id','?')}: role={msg.get('role')}, branches={msg.get('branches', [])}, content={msg.get('content','')[:30]}")
+                self.logger.debug(f"  MSG {msg.get('id','?')}: role={msg.get('role')}, branches={msg.get('branches', [])}, content={msg.get('content','')[:30]}")
             
 
             
@@ -1,11 +1,11 @@
 import asyncio
-import json
 import os
 import time
 import uuid
 from pathlib import Path
 from typing import Dict, Any
 
+from sidecar import utils
 from sidecar.api.plugin_base import PluginBase
 from sidecar.pipeline.events import PipelineEvents
 from sidecar.pipeline.types import PipelineContext
@@ -47,6 +47,16 @@ class Plugin(PluginBase):
         safe_id = "".join(x for x in chat_id if x.isalnum() or x in "-_")
         return self.memory_dir / f"{safe_id}.json"
 
+    @staticmethod
+    def _read_chat_file(chat_file: Path) -> Dict[str, Any]:
+        """Read chat data in one bytes read."""
+        return utils.loads(chat_file.read_bytes())
+
+    @staticmethod
+    def _write_chat_file(chat_file: Path, data: Dict[str, Any]) -> None:
+        """Write chat data as JSON."""
+        chat_file.write_text(utils.dumps(data), encoding="utf-8")
+
     # =========================================================================
     # Pure Persistence API - No Schema Validation
     # =========================================================================
@@ -65,8 +75,7 @@ class Plugin(PluginBase):
             return {"status": "success", "data": {"messages": []}}
             
         try:
-            with open(chat_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = self._read_chat_file(chat_file)
             return {"status": "success", "data": data}
         except Exception as e:
             self.logger.error(f"Failed to load chat {chat_file}: {e}")
@@ -87,8 +96,7 @@ class Plugin(PluginBase):
             if not self.memory_dir.exists():
                 self.memory_dir.mkdir(parents=True, exist_ok=True)
                 
-            with open(chat_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            self._write_chat_file(chat_file, data)
             
             self.logger.debug(f"Saved chat to {chat_file.name}")
             return {"status": "success"}
@@ -119,8 +127,7 @@ class Plugin(PluginBase):
         try:
             for chat_file in self.memory_dir.glob("*.json"):
                 try:
-                    with open(chat_file, "r", encoding="utf-8") as f:
-                        data = json.load(f)
+                    data = self._read_chat_file(chat_file)
                     
                     messages = data.get("messages", [])
                     if not messages:
@@ -212,13 +219,11 @@ class Plugin(PluginBase):
             return {"status": "error", "error": "Chat not found"}
             
         try:
-            with open(chat_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = self._read_chat_file(chat_file)
             
             data["title"] = title
             
-            with open(chat_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            self._write_chat_file(chat_file, data)
             
             self.logger.info(f"Renamed chat {chat_id} to: {title}")
             return {"status": "success"}
@@ -356,11 +361,9 @@ class Plugin(PluginBase):
 
             chat_file = self._get_chat_path(chat_id)
             if chat_file.exists():
-                with open(chat_file, "r", encoding="utf-8") as f:
-                    current_data = json.load(f)
+                current_data = self._read_chat_file(chat_file)
                 current_data["title"] = title
-                with open(chat_file, "w", encoding="utf-8") as f:
-                    json.dump(current_data, f, indent=2)
+                self._write_chat_file(chat_file, current_data)
                 self.logger.info(f"Auto-title: {chat_id} -> '{title}'")
 
         except Exception as e:
@@ -1,43 +1,114 @@
-"""Embedding cache backed by a JSON sidecar file."""
+"""Embedding cache backed by a binary sidecar file."""
 import hashlib
 import json
+import os
+import struct
 from pathlib import Path
 from typing import Dict, List, Optional
 
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# File layout: MAGIC (format name + version byte), then per entry a "<HI" header (key bytes, embedding bytes),
+# the UTF-8 key and the packed half-float embedding.
+_MAGIC = b"TEMB\x01"
+_ENTRY_HEADER = struct.Struct("<HI")
+
+
+def _pack(embedding: List[float]) -> bytes:
+    """Encode an embedding as little-endian IEEE half floats.
+
+    Half precision is ample for cosine ranking and takes 2 bytes per value
+    instead of a boxed Python float.
+    """
+    return struct.pack(f"<{len(embedding)}e", *embedding)
+
+
+def _unpack(packed: bytes) -> List[float]:
+    return list(struct.unpack(f"<{len(packed) // 2}e", packed))
+
 
 class EmbeddingCache:
-    """Caches message embeddings in .memory/{chat_id}.embeddings.json."""
+    """Caches message embeddings in .memory/{chat_id}.embeddings.bin."""
 
     def __init__(self, memory_dir: Path, chat_id: str):
         safe_id = "".join(c for c in chat_id if c.isalnum() or c in "-_")
-        self._path = memory_dir / f"{safe_id}.embeddings.json"
-        self._data: Dict[str, List[float]] = {}
+        self._path = memory_dir / f"{safe_id}.embeddings.bin"
+        # Earlier versions stored the cache as JSON; read it once, then replace it
+        self._legacy_path = memory_dir / f"{safe_id}.embeddings.json"
+        self._data: Dict[str, bytes] = {}
         self._load()
 
     def _load(self) -> None:
-        if self._path.exists():
-            try:
-                with open(self._path, "r", encoding="utf-8") as f:
-                    self._data = json.load(f)
-            except Exception:
-                self._data = {}
+        try:
+            if self._path.exists():
+                self._data = self._decode(self._path.read_bytes())
+            elif self._legacy_path.exists() and not XXHASH_AVAILABLE:
+                # Legacy entries are md5-keyed, so they are only reusable while
+                # _key() uses md5; otherwise save() just deletes the old file
+                with open(self._legacy_path, "r", encoding="utf-8") as f:
+                    raw = json.load(f)
+                self._data = {k: _pack(v) for k, v in raw.items()}
+        except Exception:
+            self._data = {}
+
+    @staticmethod
+    def _decode(blob: bytes) -> Dict[str, bytes]:
+        """Parse a cache file's entries.
+
+        Raises ValueError for a foreign, other-version, truncated or corrupt
+        file, so _load starts from an empty cache instead.
+        """
+        if not blob.startswith(_MAGIC):
+            raise ValueError("Not an embedding cache file (or unsupported version)")
+        data: Dict[str, bytes] = {}
+        offset = len(_MAGIC)
+        end = len(blob)
+        while offset < end:
+            if offset + _ENTRY_HEADER.size > end:
+                raise ValueError("Truncated entry header")
+            key_len, emb_len = _ENTRY_HEADER.unpack_from(blob, offset)
+            offset += _ENTRY_HEADER.size
+            if offset + key_len + emb_len > end or emb_len % 2:
+                raise ValueError("Truncated or corrupt entry")
+            key = blob[offset:offset + key_len].decode("utf-8")
+            offset += key_len
+            data[key] = blob[offset:offset + emb_len]
+            offset += emb_len
+        return data
 
     def _save(self) -> None:
+        parts = [_MAGIC]
+        for key, emb in self._data.items():
+            key_bytes = key.encode("utf-8")
+            parts += (_ENTRY_HEADER.pack(len(key_bytes), len(emb)), key_bytes, emb)
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self._path, "w", encoding="utf-8") as f:
-            json.dump(self._data, f)
+        # Write a sibling file and swap it in, so a crash mid-write can't
+        # leave a truncated cache behind
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+        tmp_path.write_bytes(b"".join(parts))
+        os.replace(tmp_path, self._path)
+        self._legacy_path.unlink(missing_ok=True)
 
     @staticmethod
     def _key(message_id: str, content: str) -> str:
-        h = hashlib.md5(content.encode()).hexdigest()[:8]
+        # Content fingerprint only needs to detect edits, not resist attacks
+        if XXHASH_AVAILABLE:
+            h = xxhash.xxh3_64_hexdigest(content.encode())[:8]
+        else:
+            h = hashlib.md5(content.encode()).hexdigest()[:8]
         return f"{message_id}:{h}"
 
     def get(self, message_id: str, content: str) -> Optional[List[float]]:
-        return self._data.get(self._key(message_id, content))
+        emb = self._data.get(self._key(message_id, content))
+        return _unpack(emb) if emb is not None else None
 
     def set(self, message_id: str, content: str, embedding: List[float]) -> None:
         """Store an embedding. Call save() to persist."""
-        self._data[self._key(message_id, content)] = embedding
+        self._data[self._key(message_id, content)] = _pack(embedding)
 
     def save(self) -> None:
         """Flush all cached embeddings to disk."""
@@ -1,11 +1,30 @@
 """Smart Context Plugin — topic map + embedding-based context filtering."""
 import asyncio
-import json
 import math
 import sys
 from pathlib import Path
 from typing import Dict, Any, List, Set
 
+# NumPy only speeds up ranking, so it is imported on the first filtered chat
+# rather than when the sidecar loads plugins. NUMPY_AVAILABLE turns False if
+# that import fails.
+NUMPY_AVAILABLE = True
+np = None
+
+
+def _load_numpy():
+    """Import NumPy on first use; None when it can't be imported."""
+    global np, NUMPY_AVAILABLE
+    if np is None and NUMPY_AVAILABLE:
+        try:
+            import numpy
+        except ImportError:
+            NUMPY_AVAILABLE = False
+        else:
+            np = numpy
+    return np
+
+
 # Make embedding_cache importable (same directory)
 _plugin_dir = Path(__file__).parent
 if str(_plugin_dir) not in sys.path:
@@ -13,18 +32,47 @@ if str(_plugin_dir) not in sys.path:
 
 from embedding_cache import EmbeddingCache
 
+from sidecar import utils
 from sidecar.api.plugin_base import PluginBase
 from sidecar.pipeline.events import PipelineEvents
 from sidecar.pipeline.types import PipelineContext
 
 
-def _cosine_similarity(a: List[float], b: List[float]) -> float:
-    dot = sum(x * y for x, y in zip(a, b))
-    norm_a = math.sqrt(sum(x * x for x in a))
-    norm_b = math.sqrt(sum(x * x for x in b))
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return dot / (norm_a * norm_b)
+def _unit_vector(v: List[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in v))
+    return [x / norm for x in v] if norm else list(v)
+
+
+def _normalize_rows(matrix: "np.ndarray") -> "np.ndarray":
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0  # zero vectors stay zero -> similarity 0.0
+    return matrix / norms
+
+
+def _max_similarities(
+    embeddings: List[List[float]], topic_embeddings: List[List[float]]
+) -> List[float]:
+    """Best cosine similarity of each embedding against any of the topic embeddings.
+
+    Uses one normalized matmul when NumPy is installed, pairwise Python otherwise.
+    """
+    if not embeddings:
+        return []
+    if NUMPY_AVAILABLE and _load_numpy() is not None:
+        m = _normalize_rows(np.asarray(embeddings, dtype=np.float32))
+        t = _normalize_rows(np.asarray(topic_embeddings, dtype=np.float32))
+        return (m @ t.T).max(axis=1).tolist()
+    # Pure-Python fallback: normalize every vector once, then each pair is a bare dot product
+    topic_units = [_unit_vector(t_emb) for t_emb in topic_embeddings]
+    return [
+        max(sum(x * y for x, y in zip(unit, t_unit)) for t_unit in topic_units)
+        for unit in map(_unit_vector, embeddings)
+    ]
+
+
+# Histories this short are sent whole: filtering them saves little context and
+# would cost an embedding round-trip on every message of a new chat.
+MIN_HISTORY_FOR_FILTERING = 8
 
 
 TOPIC_EXTRACTION_PROMPT = """\
@@ -57,12 +105,17 @@ class Plugin(PluginBase):
 
         self.similarity_threshold: float = float(self.config.get("similarity_threshold", 0.4))
         self.embedding_search: bool = bool(self.config.get("embedding_search", True))
+        self.min_history_for_filtering: int = int(
+            self.config.get("min_history_for_filtering", MIN_HISTORY_FOR_FILTERING)
+        )
 
         self.active_topics: Set[str] = set()
         self.current_chat_id: str = ""
         self._background_tasks: Set[asyncio.Task] = set()
         # Accumulated topic set — built incrementally, one exchange at a time
         self._current_topics: List[Dict[str, Any]] = []
+        # Topic label -> embedding, kept for the labels in the active filter
+        self._topic_embeddings: Dict[str, List[float]] = {}
 
         self.logger.info("Smart Context plugin initialized")
 
@@ -158,7 +211,7 @@ class Plugin(PluginBase):
                 raw = raw[:-3]
             raw = raw.strip()  # remove any leftover whitespace/newlines after fence removal
 
-        data = json.loads(raw)
+        data = utils.loads(raw)
         topics: List[Dict[str, Any]] = data.get("topics", [])
         sticky_ids: List[str] = data.get("sticky_message_ids", [])
 
@@ -230,6 +283,10 @@ class Plugin(PluginBase):
 
         return list(regular.values()) + sticky
 
+    @staticmethod
+    async def _embed_batch(llm: Any, texts: List[str]) -> List[List[float]]:
+        return await llm.embed(texts) if texts else []
+
     async def _compute_relevant_ids(
         self, chat_id: str, messages: List[Dict[str, Any]], sticky_ids: Set[str]
     ) -> List[str]:
@@ -238,10 +295,14 @@ class Plugin(PluginBase):
         Sticky IDs are always included. Returns empty list if nothing passes threshold
         (caller should fall back to full history).
         """
+        # Snapshot the filter: set_filter can change it while embeddings are in flight
+        topics = list(self.active_topics)
+        if not topics:
+            return []
+
         from sidecar.services.llm_service import get_llm_service
 
         llm = get_llm_service()
-        topic_embeddings = await llm.embed(list(self.active_topics))
 
         cache = EmbeddingCache(self.vault_path / ".memory", chat_id)
         need_embed: List[Dict[str, Any]] = []
@@ -256,9 +317,23 @@ class Plugin(PluginBase):
             else:
                 need_embed.append(msg)
 
+        # Only topics not seen since the filter was set need embedding
+        known = {t: self._topic_embeddings[t] for t in topics if t in self._topic_embeddings}
+        missing_topics = [t for t in topics if t not in known]
+        texts = [str(m.get("content", "")) for m in need_embed]
+
+        # Topics and uncached messages are independent batches: embed them concurrently
+        new_topic_embeddings, new_embeddings = await asyncio.gather(
+            self._embed_batch(llm, missing_topics), self._embed_batch(llm, texts)
+        )
+        known.update(zip(missing_topics, new_topic_embeddings))
+        topic_embeddings = [known[t] for t in topics]
+        # Cache only labels still selected; set_filter drops the rest
+        for t in missing_topics:
+            if t in self.active_topics:
+                self._topic_embeddings[t] = known[t]
+
         if need_embed:
-            texts = [str(m.get("content", "")) for m in need_embed]
-            new_embeddings = await llm.embed(texts)
             for msg, emb in zip(need_embed, new_embeddings):
                 msg_id = msg.get("id", "")
                 content = str(msg.get("content", ""))
@@ -266,17 +341,22 @@ class Plugin(PluginBase):
                 cached[msg_id] = emb
             cache.save()  # flush all new embeddings in one write
 
+        # Score every non-sticky embedded message in one batch
+        scored_ids = [
+            msg_id for msg_id in (m.get("id", "") for m in messages)
+            if msg_id not in sticky_ids and msg_id in cached
+        ]
+        similarities = dict(zip(
+            scored_ids,
+            _max_similarities([cached[i] for i in scored_ids], topic_embeddings),
+        ))
+
         included: List[str] = []
         for msg in messages:
             msg_id = msg.get("id", "")
             if msg_id in sticky_ids:
                 included.append(msg_id)
-                continue
-            emb = cached.get(msg_id)
-            if emb is None:
-                continue
-            max_sim = max(_cosine_similarity(emb, t_emb) for t_emb in topic_embeddings)
-            if max_sim >= self.similarity_threshold:
+            elif similarities.get(msg_id, float("-inf")) >= self.similarity_threshold:
                 included.append(msg_id)
 
         return included
@@ -287,7 +367,7 @@ class Plugin(PluginBase):
             return
 
         chat_id = ctx.metadata.get("chat_id")
-        if not chat_id or not ctx.history:
+        if not chat_id or len(ctx.history) <= self.min_history_for_filtering:
             return
 
         try:
@@ -323,6 +403,10 @@ class Plugin(PluginBase):
             topics = p.get("topics", [])
 
         self.active_topics = set(topics)
+        # Drop embeddings of deselected topics; labels still active stay cached
+        self._topic_embeddings = {
+            t: emb for t, emb in self._topic_embeddings.items() if t in self.active_topics
+        }
         self.emit("smart_context.filter_changed", {
             "active_topics": list(self.active_topics),
             "chat_id": self.current_chat_id,
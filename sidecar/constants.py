@@ -174,6 +174,16 @@ MIN_WEBSOCKET_PORT: Final[int] = 9000
 MAX_WEBSOCKET_PORT: Final[int] = 9999
 """Maximum WebSocket port number."""
 
+WEBSOCKET_SEND_BATCH_SIZE: Final[int] = 100
+"""Maximum queued outbound messages coalesced into one WebSocket frame."""
+
+WEBSOCKET_MAX_PENDING_MESSAGES: Final[int] = 1000
+"""Maximum outbound messages waiting for delivery, per connection and while
+no client is connected."""
+
+MAX_PERSISTED_EVENTS: Final[int] = 100
+"""Maximum frontend events kept for replay while no client is connected."""
+
 
 # ============================================================================
 # Path Constants
@@ -5,13 +5,17 @@ Handles internal Pub/Sub with priority support.
 """
 
 import asyncio
-import inspect
-from typing import Dict, List, Tuple, Any, Callable, Awaitable
-from collections import defaultdict
+from operator import itemgetter
+from typing import Dict, Iterable, List, Tuple, Any, Callable, Awaitable
 from loguru import logger
 
+from . import utils
+
 # Type aliases
 EventHandler = Callable[..., Awaitable[None]]
+Subscribers = Tuple[Tuple[int, EventHandler], ...]
+
+_by_priority = itemgetter(0)
 
 
 class EventBus:
@@ -20,9 +24,17 @@ class EventBus:
     """
 
     def __init__(self):
-        self._subscribers: Dict[str, List[Tuple[int, EventHandler]]] = defaultdict(list)
+        # (priority, handler) pairs per event, highest priority first. Each
+        # tuple is replaced rather than mutated, so publish() iterates a stable
+        # snapshot even if a handler (un)subscribes mid-dispatch.
+        self._subscribers: Dict[str, Subscribers] = {}
         self.logger = logger.bind(component="EventBus")
 
+    def _store(self, event: str, pairs: Iterable[Tuple[int, EventHandler]]) -> None:
+        """Replace an event's subscribers, sorted by descending priority."""
+        # sorted() is stable, so equal priorities keep subscription order
+        self._subscribers[event] = tuple(sorted(pairs, key=_by_priority, reverse=True))
+
     def subscribe(self, event: str, handler: EventHandler, priority: int = 0) -> None:
         """
         Subscribe to an internal event.
@@ -32,34 +44,53 @@ class EventBus:
             handler: Async callback
             priority: Execution priority (Higher runs first). Default 0.
         """
-        if not inspect.iscoroutinefunction(handler):
+        if not utils.is_async_callable(handler):
             raise ValueError("Handler must be async")
 
         # Store as tuple (priority, handler)
-        # We sort descending so higher priority is first
-        self._subscribers[event].append((priority, handler))
-        self._subscribers[event].sort(key=lambda x: x[0], reverse=True)
+        self._store(event, self._subscribers.get(event, ()) + ((priority, handler),))
 
         self.logger.debug(f"Subscribed to: {event} (priority={priority})")
 
+    def bulk_subscribe(
+        self, event: str, handlers: List[Tuple[EventHandler, int]]
+    ) -> None:
+        """
+        Subscribe several handlers to one event, sorting the list only once.
+
+        Args:
+            event: Event name
+            handlers: List of (handler, priority) pairs
+        """
+        for handler, _ in handlers:
+            if not utils.is_async_callable(handler):
+                raise ValueError("Handler must be async")
+
+        self._store(
+            event,
+            self._subscribers.get(event, ())
+            + tuple((priority, handler) for handler, priority in handlers),
+        )
+
+        self.logger.debug(f"Subscribed {len(handlers)} handlers to: {event}")
+
     def unsubscribe(self, event: str, handler: EventHandler) -> bool:
         """
         Unsubscribe from an internal event.
         Returns True if handler was found and removed.
         """
-        if event in self._subscribers:
-            handlers_list = self._subscribers[event]
-            for i, (p, h) in enumerate(handlers_list):
-                if h == handler:
-                    handlers_list.pop(i)
-                    self.logger.debug(f"Unsubscribed from: {event}")
-                    return True
+        pairs = self._subscribers.get(event, ())
+        for i, (p, h) in enumerate(pairs):
+            if h == handler:
+                self._subscribers[event] = pairs[:i] + pairs[i + 1 :]
+                self.logger.debug(f"Unsubscribed from: {event}")
+                return True
         return False
 
     def clear_subscribers(self, event: str) -> None:
         """Clear all subscribers for an event."""
         if event in self._subscribers:
-            self._subscribers[event].clear()
+            self._subscribers[event] = ()
             self.logger.debug(f"Cleared subscribers for: {event}")
 
     async def publish(
@@ -74,22 +105,27 @@ class EventBus:
                        If False, run all handlers in parallel.
             **kwargs: Arguments to pass to handlers
         """
-        priority_handlers = self._subscribers.get(event, [])
-        # print(f"DEBUG: EventBus publishing {event}, found {len(priority_handlers)} subscribers")
-        if not priority_handlers:
+        subscribers = self._subscribers.get(event)
+        if not subscribers:
             return
 
-        # Extract just the handlers in order
-        handlers = [h for _, h in priority_handlers]
-
-        async def safe_exec(h: EventHandler) -> None:
-            try:
-                await h(**kwargs)
-            except Exception as e:
-                self.logger.exception(f"Event handler failed for '{event}': {e}")
-
-        if sequential:
-            for h in handlers:
-                await safe_exec(h)
+        # A lone handler gains nothing from gather, so await it directly too
+        if sequential or len(subscribers) == 1:
+            for _, h in subscribers:
+                try:
+                    await h(**kwargs)
+                except Exception as e:
+                    self.logger.exception(f"Event handler failed for '{event}': {e}")
         else:
-            await asyncio.gather(*(safe_exec(h) for h in handlers))
+            await asyncio.gather(
+                *(self._safe_exec(event, h, kwargs) for _, h in subscribers)
+            )
+
+    async def _safe_exec(
+        self, event: str, handler: EventHandler, kwargs: Dict[str, Any]
+    ) -> None:
+        """Run one handler for a parallel publish, logging instead of raising."""
+        try:
+            await handler(**kwargs)
+        except Exception as e:
+            self.logger.exception(f"Event handler failed for '{event}': {e}")
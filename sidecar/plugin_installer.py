@@ -16,7 +16,7 @@ import tempfile
 import zipfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from enum import Enum
 
 import httpx
@@ -112,21 +112,10 @@ class PluginInstaller:
         self._logger.info(f"Installing plugin '{plugin_id}' from {repo_url}")
 
         try:
-            # Clone the repository using async subprocess
-            process = await asyncio.create_subprocess_exec(
-                "git",
-                "clone",
-                "--depth",
-                "1",
-                repo_url,
-                str(plugin_dir),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
+            # Clone the repository
+            returncode, stdout, stderr = await self._clone(repo_url, plugin_dir)
 
-            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=60)
-
-            if process.returncode != 0:
+            if returncode != 0:
                 error_msg = stderr.decode() if stderr else "Unknown error"
                 self._logger.error(f"Git clone failed: {error_msg}")
                 return InstallResult(
@@ -553,6 +542,22 @@ class PluginInstaller:
         self._logger.info(f"Found {len(plugins)} installed plugins")
         return plugins
 
+    async def _clone(self, repo_url: str, dest: Path) -> Tuple[int, bytes, bytes]:
+        """Shallow-clone a repository. Returns (returncode, stdout, stderr)."""
+        process = await asyncio.create_subprocess_exec(
+            "git",
+            "clone",
+            "--depth",
+            "1",
+            repo_url,
+            str(dest),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=60)
+        return process.returncode, stdout, stderr
+
     async def _install_dependencies(self, requirements_file: Path) -> bool:
         """Install Python dependencies from requirements.txt."""
         try:
@@ -4,8 +4,12 @@ Pytest configuration for Tailor sidecar tests.
 This module configures pytest for testing the refactored codebase.
 """
 
+import functools
+import importlib.util
+import shutil
 import sys
 from pathlib import Path
+from typing import Iterable, Optional
 
 # Add tailor root to path for imports (allow 'sidecar' package import)
 tailor_path = Path(__file__).resolve().parent.parent.parent
@@ -13,23 +17,166 @@ if str(tailor_path) not in sys.path:
     sys.path.insert(0, str(tailor_path))
 
 
+@functools.lru_cache(maxsize=None)
+def load_plugin_module(path: str, module_name: str):
+    """Load an example-vault plugin's main.py as a standalone module.
+
+    Memoized so each plugin file is executed once; pass ``path`` as a str to keep
+    the cache key stable.
+    """
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def emitted_actions(emit_mock) -> dict:
+    """Map each UI action sent through an ``emit_to_frontend`` mock to its (last) payload."""
+    return {
+        c.kwargs.get("data", {}).get("action"): c.kwargs["data"]
+        for c in emit_mock.call_args_list
+    }
+
+
 # Pytest configuration
 def pytest_configure(config):
     """Configure pytest with custom markers."""
     config.addinivalue_line("markers", "unit: mark test as a unit test")
     config.addinivalue_line("markers", "integration: mark test as an integration test")
     config.addinivalue_line("markers", "slow: mark test as slow running")
+    # Provided by pytest-xdist; registered here so serial runs don't warn
+    config.addinivalue_line(
+        "markers", "xdist_group(name): keep tests on one worker under --dist loadgroup"
+    )
 
 
 import pytest
+from unittest.mock import AsyncMock, MagicMock, create_autospec, patch
+
+@pytest.fixture(autouse=True)
+def reset_vault_brain_singleton():
+    """Reset the VaultBrain singleton before and after every test.
+
+    Only touches the class if ``sidecar.vault_brain`` has already been
+    imported, so pure unit tests don't pay for importing it.
+    """
+    module = sys.modules.get("sidecar.vault_brain")
+    if module is not None:
+        module.VaultBrain._instance = None
+    yield
+    module = sys.modules.get("sidecar.vault_brain")
+    if module is not None:
+        module.VaultBrain._instance = None
+
+
+@pytest.fixture
+def mock_brain():
+    """Mock VaultBrain limited to the surface PluginBase talks to.
+
+    ``spec`` stops MagicMock from inventing attributes on access, so a typo
+    in a plugin helper fails loudly instead of returning another mock.
+    """
+    brain = MagicMock(
+        spec=[
+            "emit_to_frontend",
+            "notify_frontend",
+            "update_state",
+            "publish",
+            "subscribe",
+            "register_command",
+            "is_client_connected",
+        ]
+    )
+    brain.publish = AsyncMock()
+    return brain
+
+
+@pytest.fixture(scope="module")
+def autospec_brain(vault_brain_mod):
+    """Mock VaultBrain autospecced from the real class, built once per module.
+
+    Autospec keeps plugin calls honest against the real VaultBrain signatures.
+    ``VaultBrain.get`` returns it for the whole module: the example plugins are
+    stateless, so one instance serves every test in a module.
+    """
+    brain = create_autospec(vault_brain_mod.VaultBrain, instance=True)
+    with patch.object(vault_brain_mod.VaultBrain, "get", return_value=brain):
+        yield brain
+
 
 @pytest.fixture(scope="session")
 def project_root() -> Path:
-    """Return the project root path."""
-    return Path(__file__).resolve().parent.parent.parent
+    """Return the project root path (resolved once at import)."""
+    return tailor_path
 
 
 @pytest.fixture(scope="session")
 def example_vault_path(project_root) -> Path:
     """Return the path to the example vault."""
     return project_root / "example-vault"
+
+
+@pytest.fixture(scope="session")
+def demo_ui_module(example_vault_path):
+    """The demo_ui plugin module, loaded once per session."""
+    return load_plugin_module(
+        str(example_vault_path / "plugins" / "demo_ui" / "main.py"), "demo_ui_plugin"
+    )
+
+
+@pytest.fixture(scope="session")
+def prompt_refiner_module(example_vault_path):
+    """The prompt_refiner plugin module, loaded once per session."""
+    return load_plugin_module(
+        str(example_vault_path / "plugins" / "prompt_refiner" / "main.py"),
+        "prompt_refiner_plugin",
+    )
+
+
+@pytest.fixture(scope="session")
+def smart_context_module(example_vault_path):
+    """The smart_context plugin module, loaded once per session."""
+    return load_plugin_module(
+        str(example_vault_path / "plugins" / "smart_context" / "main.py"),
+        "smart_context_main",
+    )
+
+
+@pytest.fixture(scope="session")
+def make_vault_copy(tmp_path_factory, example_vault_path):
+    """Return a factory that copies the example vault (config + plugins) under a tmp root.
+
+    Pass ``plugins`` to copy only those plugin directories, so tests that exercise
+    a couple of plugins don't pay for loading and activating the rest.
+    """
+
+    def _make(plugins: Optional[Iterable[str]] = None) -> Path:
+        vault = tmp_path_factory.mktemp("vault", numbered=True)
+        shutil.copy2(example_vault_path / ".vault.toml", vault / ".vault.toml")
+        ignore = shutil.ignore_patterns("__pycache__")
+        if plugins is None:
+            shutil.copytree(example_vault_path / "plugins", vault / "plugins", ignore=ignore)
+        else:
+            for name in plugins:
+                shutil.copytree(
+                    example_vault_path / "plugins" / name,
+                    vault / "plugins" / name,
+                    ignore=ignore,
+                )
+        return vault
+
+    return _make
+
+
+@pytest.fixture
+def vault_copy(make_vault_copy) -> Path:
+    """Return a fresh copy of the example vault for this test."""
+    return make_vault_copy()
+
+
+@pytest.fixture(scope="session")
+def vault_brain_mod():
+    """Import ``sidecar.vault_brain`` lazily, once per session (or xdist worker)."""
+    import sidecar.vault_brain as module
+
+    return module
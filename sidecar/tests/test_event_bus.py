@@ -2,6 +2,7 @@
 Tests for EventBus.
 """
 
+import functools
 import pytest
 from unittest.mock import AsyncMock
 from sidecar.event_bus import EventBus
@@ -23,6 +24,18 @@ async def test_subscribe_validation(event_bus):
         event_bus.subscribe("test", sync_handler)
 
 
+async def test_subscribe_accepts_wrapped_async_handlers(event_bus):
+    """Handlers without their own code object are still recognised as async."""
+
+    async def handler(tag, **kwargs):
+        pass
+
+    event_bus.subscribe("test", functools.partial(handler, "tag"))
+    event_bus.subscribe("test", AsyncMock())
+
+    assert len(event_bus._subscribers["test"]) == 2
+
+
 @pytest.mark.asyncio
 async def test_subscribe_priority(event_bus):
     """Test that handlers are sorted by priority."""
@@ -46,6 +59,31 @@ async def test_subscribe_priority(event_bus):
     assert call_order == ["high", "mid", "low"]
 
 
+@pytest.mark.asyncio
+async def test_bulk_subscribe(event_bus):
+    """Test bulk subscription keeps priority order and validates handlers."""
+    call_order = []
+
+    async def handler_low(**kwargs):
+        call_order.append("low")
+
+    async def handler_high(**kwargs):
+        call_order.append("high")
+
+    def sync_handler():
+        pass
+
+    event_bus.subscribe("test", handler_low, priority=0)
+    event_bus.bulk_subscribe("test", [(handler_high, 100)])
+
+    with pytest.raises(ValueError, match="Handler must be async"):
+        event_bus.bulk_subscribe("test", [(handler_high, 10), (sync_handler, 0)])
+
+    await event_bus.publish("test", sequential=True)
+
+    assert call_order == ["high", "low"]
+
+
 @pytest.mark.asyncio
 async def test_unsubscribe(event_bus):
     """Test unsubscribing handlers."""
@@ -115,7 +153,10 @@ async def test_handler_error_safety(event_bus):
     async def failing_handler(**kwargs):
         raise RuntimeError("Oops")
 
-    working_handler = AsyncMock()
+    called = [False]
+
+    async def working_handler(**kwargs):
+        called[0] = True
 
     event_bus.subscribe("test", failing_handler, priority=10)
     event_bus.subscribe("test", working_handler, priority=0)
@@ -123,4 +164,41 @@ async def test_handler_error_safety(event_bus):
     # Should not raise exception
     await event_bus.publish("test", sequential=True)
 
-    working_handler.assert_called()
+    assert called[0]
+
+
+async def test_unsubscribe_during_publish(event_bus):
+    """A handler unsubscribing mid-dispatch doesn't skip the rest of that publish."""
+    calls = []
+
+    async def once(**kwargs):
+        calls.append("once")
+        event_bus.unsubscribe("test", once)
+
+    async def always(**kwargs):
+        calls.append("always")
+
+    event_bus.subscribe("test", once, priority=10)
+    event_bus.subscribe("test", always)
+
+    await event_bus.publish("test", sequential=True)
+    await event_bus.publish("test", sequential=True)
+
+    assert calls == ["once", "always", "always"]
+
+
+@pytest.mark.parametrize("handlers", [1, 2])
+async def test_parallel_publish_contains_errors(event_bus, handlers):
+    """Failures are logged, not raised, whether or not gather is used."""
+    calls = []
+
+    async def failing_handler(**kwargs):
+        calls.append(kwargs)
+        raise RuntimeError("Oops")
+
+    for priority in range(handlers):
+        event_bus.subscribe("test", failing_handler, priority=priority)
+
+    await event_bus.publish("test", arg="value")
+
+    assert calls == [{"arg": "value"}] * handlers
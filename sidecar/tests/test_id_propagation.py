@@ -1,23 +1,19 @@
 import pytest
 import asyncio
+from types import SimpleNamespace
 from unittest.mock import MagicMock, AsyncMock
 
-from sidecar.vault_brain import VaultBrain
-from sidecar.services.llm_service import LLMService
 from sidecar import constants
-from sidecar.pipeline.events import PipelineEvents
-from sidecar.pipeline.default import DefaultPipeline
-
-
-@pytest.fixture(autouse=True)
-def reset_singleton():
-    VaultBrain._instance = None
-    yield
-    VaultBrain._instance = None
 
 
 @pytest.mark.asyncio
-async def test_id_propagation():
+async def test_id_propagation(vault_brain_mod):
+    VaultBrain = vault_brain_mod.VaultBrain
+    # Imported here, like VaultBrain, to keep litellm out of test collection
+    from sidecar.pipeline.default import DefaultPipeline
+    from sidecar.pipeline.events import PipelineEvents
+    from sidecar.services.llm_service import LLMService
+
     # Setup
     if VaultBrain._instance is None:
         brain = VaultBrain(MagicMock(), MagicMock())
@@ -40,7 +36,7 @@ async def test_id_propagation():
     # Mock LLMService to return a predictable response
     mock_llm = MagicMock(spec=LLMService)
     mock_llm.complete = AsyncMock(
-        return_value=MagicMock(content="Test Response", model="test", usage={})
+        return_value=SimpleNamespace(content="Test Response", model="test", usage={})
     )
 
     brain._llm_service = mock_llm
@@ -72,7 +68,7 @@ async def test_id_propagation():
             "assistant_message_id": "uuid-assist-123",
         }
 
-    brain.subscribe(PipelineEvents.OUTPUT, mock_save_interaction)
+    brain.events.bulk_subscribe(PipelineEvents.OUTPUT, [(mock_save_interaction, 0)])
 
     # TEST 1: Non-Streaming
     res = await brain.chat_send(message="Hello", chat_id="test_chat", stream=False)
@@ -125,5 +121,7 @@ async def test_id_propagation():
 
 
 if __name__ == "__main__":
-    asyncio.run(test_id_propagation())
+    import sidecar.vault_brain
+
+    asyncio.run(test_id_propagation(sidecar.vault_brain))
     print("Test passed!")
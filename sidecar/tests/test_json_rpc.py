@@ -86,6 +86,8 @@ class TestHelpers:
 
         assert utils.get_params(msg_with_params) == {"key": "val"}
         assert utils.get_params(msg_without_params) == {}
+        assert utils.get_params({"params": [1, 2]}) == {"args": [1, 2]}
+        assert utils.get_params({"params": None}) == {}
 
     def test_get_request_id(self):
         """Test get_request_id helper."""
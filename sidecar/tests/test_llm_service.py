@@ -3,13 +3,22 @@ Tests for LLM Service.
 """
 
 import pytest
-from pathlib import Path
+from types import SimpleNamespace as NS
 from unittest.mock import MagicMock, AsyncMock, patch
 
 from sidecar.services.llm_service import LLMService
 
 
-@pytest.fixture
+def _ollama_client(models):
+    """Build a mock httpx.AsyncClient whose GET returns an Ollama /api/tags payload."""
+    payload = {"models": models}
+    client = AsyncMock()
+    client.get.return_value = NS(status_code=200, json=lambda: payload)
+    client.__aenter__.return_value = client
+    return client
+
+
+@pytest.fixture(scope="module")
 def mock_keyring():
     with patch("sidecar.services.llm_service.get_keyring_service") as mock:
         service = MagicMock()
@@ -19,8 +28,9 @@ def mock_keyring():
         yield service
 
 
-@pytest.fixture
-def llm_service(tmp_path, mock_keyring):
+@pytest.fixture(scope="module")
+def llm_service(tmp_path_factory, mock_keyring):
+    # Shared by the whole module; tests that mutate it restore state via monkeypatch
     config = {
         "categories": {"fast": "openai/gpt-4o-mini"},
         "defaults": {"temperature": 0.7},
@@ -29,7 +39,7 @@ def llm_service(tmp_path, mock_keyring):
     with patch.object(
         LLMService, "_load_registry", return_value={"categories": {}, "recommended": {}}
     ):
-        service = LLMService(tmp_path, config)
+        service = LLMService(tmp_path_factory.mktemp("llm"), config)
         return service
 
 
@@ -40,7 +50,7 @@ async def test_initialization(llm_service):
 
 
 @pytest.mark.asyncio
-async def test_get_available_models(llm_service):
+async def test_get_available_models(llm_service, monkeypatch):
     # Mock LiteLLM cost data
     mock_cost = {
         "gpt-4o-mini": {"max_tokens": 128000},
@@ -49,12 +59,16 @@ async def test_get_available_models(llm_service):
 
     with patch("sidecar.services.llm_service.litellm.model_cost", mock_cost):
         # We also need to mock _registry to have some recommended models
-        llm_service._registry = {
-            "categories": {
-                "fast": {"recommended": ["openai/gpt-4o-mini"]},
-                "thinking": {"recommended": ["anthropic/claude-3-5-sonnet-20241022"]},
-            }
-        }
+        monkeypatch.setattr(
+            llm_service,
+            "_registry",
+            {
+                "categories": {
+                    "fast": {"recommended": ["openai/gpt-4o-mini"]},
+                    "thinking": {"recommended": ["anthropic/claude-3-5-sonnet-20241022"]},
+                }
+            },
+        )
 
         models = await llm_service.get_available_models()
 
@@ -68,16 +82,15 @@ async def test_get_available_models(llm_service):
 
 @pytest.mark.asyncio
 async def test_complete_sync(llm_service):
-    mock_response = MagicMock()
-    mock_response.choices = [
-        MagicMock(message=MagicMock(content="Hello"), finish_reason="stop")
-    ]
-    mock_response.usage = MagicMock(
-        prompt_tokens=10, completion_tokens=5, total_tokens=15
+    mock_response = NS(
+        choices=[NS(message=NS(content="Hello"), finish_reason="stop")],
+        usage=NS(prompt_tokens=10, completion_tokens=5, total_tokens=15),
     )
 
     with patch(
-        "sidecar.services.llm_service.acompletion", return_value=mock_response
+        "sidecar.services.llm_service.acompletion",
+        new_callable=AsyncMock,
+        return_value=mock_response,
     ) as mock_complete:
         response = await llm_service.complete(
             messages=[{"role": "user", "content": "Hi"}], category="fast"
@@ -96,15 +109,14 @@ async def test_complete_sync(llm_service):
 async def test_complete_stream(llm_service):
     # Mock async generator for streaming
     async def mock_stream(*args, **kwargs):
-        chunk1 = MagicMock()
-        chunk1.choices = [MagicMock(delta=MagicMock(content="Hello"))]
-        yield chunk1
+        yield NS(choices=[NS(delta=NS(content="Hello"))])
+        yield NS(choices=[NS(delta=NS(content=" World"))])
 
-        chunk2 = MagicMock()
-        chunk2.choices = [MagicMock(delta=MagicMock(content=" World"))]
-        yield chunk2
-
-    with patch("sidecar.services.llm_service.acompletion", side_effect=mock_stream):
+    with patch(
+        "sidecar.services.llm_service.acompletion",
+        new_callable=AsyncMock,
+        side_effect=mock_stream,
+    ):
         gen = await llm_service.complete(
             messages=[{"role": "user", "content": "Hi"}], category="fast", stream=True
         )
@@ -117,17 +129,22 @@ async def test_complete_stream(llm_service):
 
 
 @pytest.mark.asyncio
-async def test_guardrails_o1(llm_service):
+async def test_guardrails_o1(llm_service, monkeypatch):
+    # Work on a copy of the categories so the shared service is left untouched
+    monkeypatch.setattr(llm_service, "_categories", dict(llm_service._categories))
+
     # Check if o1 models enforce temperature=1
     llm_service.set_category_model("reasoning", "openai/o1-preview")
 
-    mock_response = MagicMock()
-    mock_response.choices = [
-        MagicMock(message=MagicMock(content="Thinking..."), finish_reason="stop")
-    ]
+    mock_response = NS(
+        choices=[NS(message=NS(content="Thinking..."), finish_reason="stop")],
+        usage=None,
+    )
 
     with patch(
-        "sidecar.services.llm_service.acompletion", return_value=mock_response
+        "sidecar.services.llm_service.acompletion",
+        new_callable=AsyncMock,
+        return_value=mock_response,
     ) as mock_complete:
         await llm_service.complete(
             messages=[{"role": "user", "content": "Solve"}],
@@ -141,16 +158,18 @@ async def test_guardrails_o1(llm_service):
 
 
 @pytest.mark.asyncio
-async def test_embed_returns_list_of_vectors():
-    with patch("sidecar.services.llm_service.aembedding") as mock_embed:
-        mock_embed.return_value = MagicMock(
+async def test_embed_returns_list_of_vectors(tmp_path):
+    with patch(
+        "sidecar.services.llm_service.aembedding", new_callable=AsyncMock
+    ) as mock_embed:
+        mock_embed.return_value = NS(
             data=[
                 {"embedding": [0.1, 0.2, 0.3]},
                 {"embedding": [0.4, 0.5, 0.6]},
             ]
         )
         service = LLMService(
-            Path("/tmp"),
+            tmp_path,
             {"categories": {"embedding": "openai/text-embedding-3-large"}}
         )
         result = await service.embed(["hello", "world"])
@@ -168,25 +187,17 @@ async def test_embed_raises_when_no_embedding_model(llm_service):
 
 @pytest.mark.asyncio
 async def test_detect_ollama(llm_service):
-    # Mock httpx
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {
-        "models": [
-            {
-                "name": "llama3:latest",
-                "size": 1000000,
-                "modified_at": "2024-01-01",
-                "digest": "sha256:123",
-            }
-        ]
-    }
-
     with patch("httpx.AsyncClient") as mock_client_cls:
-        mock_client = AsyncMock()
-        mock_client.get.return_value = mock_response
-        mock_client.__aenter__.return_value = mock_client
-        mock_client_cls.return_value = mock_client
+        mock_client_cls.return_value = _ollama_client(
+            [
+                {
+                    "name": "llama3:latest",
+                    "size": 1000000,
+                    "modified_at": "2024-01-01",
+                    "digest": "sha256:123",
+                }
+            ]
+        )
 
         models = await llm_service.detect_ollama(force_refresh=True)
 
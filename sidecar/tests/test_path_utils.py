@@ -68,6 +68,25 @@ class TestValidatePluginStructure:
         with pytest.raises(exceptions.PluginLoadError, match="missing main.py"):
             utils.validate_plugin_structure(plugin_dir)
 
+    @pytest.mark.parametrize(
+        "layout, message",
+        [
+            ("missing", "does not exist"),
+            ("file", "not a directory"),
+            ("main_is_dir", "main.py is not a file"),
+        ],
+    )
+    def test_invalid_plugin_paths(self, tmp_path, layout, message):
+        """Each kind of broken plugin path gets its own error."""
+        plugin_dir = tmp_path / "plugin"
+        if layout == "file":
+            plugin_dir.write_text("")
+        elif layout == "main_is_dir":
+            (plugin_dir / "main.py").mkdir(parents=True)
+
+        with pytest.raises(exceptions.PluginLoadError, match=message):
+            utils.validate_plugin_structure(plugin_dir)
+
     def test_plugin_with_optional_files(self, tmp_path):
         """Test plugin with optional settings.json and README."""
         plugin_dir = tmp_path / "full_plugin"
@@ -78,3 +97,22 @@ class TestValidatePluginStructure:
 
         # Should still validate successfully
         utils.validate_plugin_structure(plugin_dir)
+
+
+@pytest.mark.unit
+class TestDiscoverPlugins:
+    """Test plugin directory discovery."""
+
+    def test_discovers_sorted_plugin_dirs(self, tmp_path):
+        """Only visible directories with a main.py are returned, by name."""
+        for name in ("zeta", "alpha", ".hidden", "_private", "no_main"):
+            (tmp_path / name).mkdir()
+        for name in ("zeta", "alpha", ".hidden", "_private"):
+            (tmp_path / name / "main.py").write_text("class Plugin: pass")
+        (tmp_path / "main.py").write_text("")
+
+        assert utils.discover_plugins(tmp_path) == [tmp_path / "alpha", tmp_path / "zeta"]
+
+    def test_empty_directory(self, tmp_path):
+        """An empty plugins directory yields no plugins."""
+        assert utils.discover_plugins(tmp_path) == []
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 from sidecar.pipeline.default import DefaultPipeline
 from sidecar.pipeline.types import PipelineConfig, PipelineContext
@@ -11,6 +11,12 @@ def mock_llm_service():
     service.complete = AsyncMock(return_value=LLMResponse(content="mocked response", model="test-model"))
     return service
 
+@pytest.fixture(autouse=True)
+def mock_brain_instance(monkeypatch):
+    brain = AsyncMock()
+    monkeypatch.setattr("sidecar.vault_brain.VaultBrain.get", lambda: brain)
+    return brain
+
 @pytest.fixture
 def config():
     return PipelineConfig(category="test")
@@ -23,14 +29,12 @@ def pipeline(config, mock_llm_service):
 
 @pytest.mark.asyncio
 async def test_pipeline_run(pipeline, mock_llm_service):
-    mock_brain_instance = AsyncMock()
-    with patch("sidecar.vault_brain.VaultBrain.get", return_value=mock_brain_instance):
-        result = await pipeline.run(message="Hello")
-        
-        assert isinstance(result, PipelineContext)
-        assert result.response == "mocked response"
-        mock_llm_service.complete.assert_called_once()
-        
+    result = await pipeline.run(message="Hello")
+
+    assert isinstance(result, PipelineContext)
+    assert result.response == "mocked response"
+    mock_llm_service.complete.assert_called_once()
+
 @pytest.mark.asyncio
 async def test_pipeline_stream_run(pipeline, mock_llm_service):
     # Setup mock stream
@@ -47,14 +51,13 @@ async def test_pipeline_stream_run(pipeline, mock_llm_service):
     assert tokens == ["token1", "token2"]
 
 @pytest.mark.asyncio
-async def test_nodes_abort_handling(pipeline):
-    mock_brain_instance = AsyncMock()
-    with patch("sidecar.vault_brain.VaultBrain.get", return_value=mock_brain_instance):
-        context = PipelineContext(message="test", original_message="test")
-        context.should_abort = True
-        
-        # When aborted, these nodes should return an empty dict to skip updating state
-        assert await pipeline.nodes.context_node(context) == {}
-        assert await pipeline.nodes.prompt_node(context) == {}
-        assert await pipeline.nodes.llm_node(context) == {}
-        assert await pipeline.nodes.post_process_node(context) == {}
+@pytest.mark.parametrize(
+    "node_name", ["context_node", "prompt_node", "llm_node", "post_process_node"]
+)
+async def test_nodes_abort_handling(pipeline, node_name):
+    context = PipelineContext(message="test", original_message="test")
+    context.should_abort = True
+
+    # When aborted, nodes should return an empty dict to skip updating state
+    node = getattr(pipeline.nodes, node_name)
+    assert await node(context) == {}
@@ -2,41 +2,50 @@
 Tests for PluginInstaller.
 """
 
+import uuid
+
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
 from sidecar.plugin_installer import PluginInstaller, InstallStatus
 
 
+@pytest.fixture(scope="session")
+def _vault_root(tmp_path_factory):
+    return tmp_path_factory.mktemp("vaults")
+
+
 @pytest.fixture
-def vault_path(tmp_path):
-    v = tmp_path / "vault"
-    v.mkdir()
-    (v / "plugins").mkdir()
+def vault_path(_vault_root):
+    # Unique vault per test under one session-wide root
+    v = _vault_root / uuid.uuid4().hex
+    (v / "plugins").mkdir(parents=True)
     return v
 
 
+@pytest.fixture(scope="session")
+def installer(_vault_root):
+    """Shared installer for checks that don't touch the plugins directory."""
+    return PluginInstaller(_vault_root)
+
+
 @pytest.fixture
-def installer(vault_path):
+def vault_installer(vault_path):
+    """Installer bound to this test's own vault, for install/uninstall flows."""
     return PluginInstaller(vault_path)
 
 
-@pytest.mark.asyncio
-async def test_extract_plugin_id(installer):
-    assert (
-        installer._extract_plugin_id("https://github.com/user/plugin-name")
-        == "plugin-name"
-    )
-    assert (
-        installer._extract_plugin_id("https://github.com/user/plugin-name.git")
-        == "plugin-name"
-    )
-    assert (
-        installer._extract_plugin_id("https://example.com/download/my_plugin.zip")
-        == "my_plugin.zip"
-    )
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://github.com/user/plugin-name", "plugin-name"),
+        ("https://github.com/user/plugin-name.git", "plugin-name"),
+        ("https://example.com/download/my_plugin.zip", "my_plugin.zip"),
+    ],
+)
+def test_extract_plugin_id(installer, url, expected):
+    assert installer._extract_plugin_id(url) == expected
 
 
-@pytest.mark.asyncio
 async def test_validate_valid_plugin(installer, vault_path):
     """Test validation of a valid plugin structure."""
     p_dir = vault_path / "plugins" / "valid_plugin"
@@ -49,7 +58,6 @@ async def test_validate_valid_plugin(installer, vault_path):
     assert len(result.errors) == 0
 
 
-@pytest.mark.asyncio
 async def test_validate_invalid_plugin(installer, vault_path):
     """Test validation of an invalid plugin."""
     p_dir = vault_path / "plugins" / "invalid_plugin"
@@ -62,70 +70,83 @@ async def test_validate_invalid_plugin(installer, vault_path):
     assert "Missing required file: main.py" in result.errors
 
 
-@pytest.mark.asyncio
-async def test_install_already_exists(installer, vault_path):
-    """Test installing a plugin that already exists."""
-    p_id = "existing_plugin"
-    (vault_path / "plugins" / p_id).mkdir()
+class TestInstall:
+    """install() flows, with git clone stubbed once for the whole class."""
 
-    result = await installer.install("http://repo", plugin_id=p_id)
-    assert result.status == InstallStatus.ALREADY_EXISTS
+    @pytest.fixture(autouse=True)
+    def mock_clone(self, monkeypatch):
+        clone = AsyncMock(return_value=(0, b"", b""))
+        monkeypatch.setattr(PluginInstaller, "_clone", clone)
+        return clone
 
+    async def test_install_already_exists(self, vault_installer, vault_path, mock_clone):
+        """Test installing a plugin that already exists."""
+        p_id = "existing_plugin"
+        (vault_path / "plugins" / p_id).mkdir()
 
-@pytest.mark.asyncio
-async def test_install_git_clone_success(installer, vault_path):
-    """Test successful installation via git clone."""
+        result = await vault_installer.install("http://repo", plugin_id=p_id)
+        assert result.status == InstallStatus.ALREADY_EXISTS
+        mock_clone.assert_not_called()
 
-    # Mock subprocess
-    process_mock = MagicMock()
-    process_mock.communicate = AsyncMock(return_value=(b"", b""))
-    process_mock.returncode = 0
+    async def test_install_git_clone_success(
+        self, vault_installer, vault_path, mock_clone, monkeypatch
+    ):
+        """Test successful installation via git clone."""
 
-    # Simulate git clone side effect
-    def clone_side_effect(*args, **kwargs):
-        (vault_path / "plugins" / "test_plugin").mkdir()
-        return process_mock
+        # Simulate git clone side effect
+        async def fake_clone(repo_url, dest):
+            dest.mkdir()
+            return 0, b"", b""
+
+        mock_clone.side_effect = fake_clone
 
-    with patch(
-        "asyncio.create_subprocess_exec", side_effect=clone_side_effect
-    ) as mock_exec:
         # We need to mock validate to return True, otherwise it will fail because no files are actually cloned
-        with patch.object(installer, "validate") as mock_validate:
-            mock_validate.return_value = MagicMock(valid=True, manifest={})
+        monkeypatch.setattr(
+            vault_installer,
+            "validate",
+            AsyncMock(return_value=MagicMock(valid=True, manifest={})),
+        )
+
+        result = await vault_installer.install("http://repo.git", plugin_id="test_plugin")
+
+        assert result.status == InstallStatus.SUCCESS, result.message
+        assert (vault_path / "plugins" / "test_plugin" / "settings.json").exists()
 
-            result = await installer.install("http://repo.git", plugin_id="test_plugin")
-            if result.status != InstallStatus.SUCCESS:
-                print(f"DEBUG: Install failed with message: {result.message}")
+    async def test_install_git_clone_failure(self, vault_installer, mock_clone):
+        """Test failed installation via git clone."""
+        mock_clone.return_value = (1, b"", b"git error")
 
-            assert result.status == InstallStatus.SUCCESS
-            assert (vault_path / "plugins" / "test_plugin" / "settings.json").exists()
+        result = await vault_installer.install("http://repo.git", plugin_id="fail_plugin")
 
+        assert result.status == InstallStatus.CLONE_FAILED
+        assert "git error" in result.message
 
-@pytest.mark.asyncio
-async def test_install_git_clone_failure(installer):
-    """Test failed installation via git clone."""
 
+async def test_clone_runs_shallow_git_clone(installer, tmp_path):
+    """Test _clone shells out to a shallow git clone and returns its result."""
     process_mock = MagicMock()
-    process_mock.communicate = AsyncMock(return_value=(b"", b"git error"))
-    process_mock.returncode = 1
+    process_mock.communicate = AsyncMock(return_value=(b"out", b"err"))
+    process_mock.returncode = 0
+    dest = tmp_path / "dest"
 
-    with patch("asyncio.create_subprocess_exec", return_value=process_mock):
-        result = await installer.install("http://repo.git", plugin_id="fail_plugin")
+    with patch("asyncio.create_subprocess_exec", return_value=process_mock) as mock_exec:
+        result = await installer._clone("http://repo.git", dest)
 
-        assert result.status == InstallStatus.CLONE_FAILED
-        assert "git error" in result.message
+    assert result == (0, b"out", b"err")
+    assert mock_exec.call_args.args == (
+        "git", "clone", "--depth", "1", "http://repo.git", str(dest)
+    )
 
 
-@pytest.mark.asyncio
-async def test_uninstall(installer, vault_path):
+async def test_uninstall(vault_installer, vault_path):
     """Test uninstallation."""
     p_id = "test_plugin"
     p_dir = vault_path / "plugins" / p_id
     p_dir.mkdir()
     (p_dir / "file.txt").touch()
 
-    assert await installer.uninstall(p_id) is True
+    assert await vault_installer.uninstall(p_id) is True
     assert not p_dir.exists()
 
     # Uninstall non-existent
-    assert await installer.uninstall("non_existent") is False
+    assert await vault_installer.uninstall("non_existent") is False
@@ -3,61 +3,87 @@ Tests for Smart Context Plugin.
 """
 
 import asyncio
+import functools
+import hashlib
 import json
+import math
+import sys
 import pytest
-from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 from sidecar import constants
 from sidecar.pipeline.types import PipelineContext
 
-# Import the plugin module dynamically since it's not in the main package
-import importlib.util
+from conftest import emitted_actions
 
-
-def load_plugin_module(plugin_path):
-    spec = importlib.util.spec_from_file_location(
-        "smart_context_main", plugin_path / "main.py"
-    )
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module
+# Canned 2-D embeddings shared by the similarity tests (read-only)
+_TOPIC_EMBS = [[0.9, 0.1]]                 # "Python Async"
+_MSG_EMBS = [[0.85, 0.15], [0.1, 0.95]]    # m1=similar, m2=dissimilar
+_STICKY_EMB = [0.0, 1.0]                   # orthogonal to the topic
 
 
-@pytest.fixture
-def smart_context_plugin_cls(tmp_path):
+@pytest.fixture(scope="session")
+def smart_context_plugin_cls(smart_context_module):
     """Load the Smart Context plugin class."""
-    # We need to point to the actual plugin location
-    # Assuming test is run from project root, locate the plugin
-    base_dir = Path(__file__).resolve().parent.parent.parent
-    plugin_path = base_dir / "example-vault" / "plugins" / "smart_context"
-
-    module = load_plugin_module(plugin_path)
-    return module.Plugin
+    return smart_context_module.Plugin
 
 
-@pytest.fixture
-def mock_brain():
-    """Create a mock VaultBrain."""
+@pytest.fixture(scope="session")
+def _mock_brain_template():
+    """Build the mock VaultBrain once; tests share it and reset it in between."""
     brain = MagicMock()
     brain.emit_to_frontend = MagicMock()
     brain.notify_frontend = MagicMock()
+    brain.execute_command = AsyncMock()
     return brain
 
 
 @pytest.fixture
-def plugin_instance(smart_context_plugin_cls, tmp_path, mock_brain):
-    """Create an instance of the Smart Context plugin."""
-    plugin_dir = tmp_path / "plugins" / "smart_context"
-    plugin_dir.mkdir(parents=True)
-    vault_path = tmp_path / "vault"
-    vault_path.mkdir()
+def mock_brain(_mock_brain_template):
+    """The shared mock VaultBrain, with calls and canned results cleared after each test."""
+    yield _mock_brain_template
+    _mock_brain_template.reset_mock(return_value=True, side_effect=True)
+
+
+class FakeEmbeddingCache:
+    """In-memory stand-in for EmbeddingCache, keyed by chat like the real file layout."""
+
+    def __init__(self, store, memory_dir, chat_id):
+        self._data = store.setdefault(chat_id, {})
+
+    def get(self, message_id, content):
+        return self._data.get((message_id, content))
+
+    def set(self, message_id, content, embedding):
+        self._data[(message_id, content)] = list(embedding)
+
+    def save(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def _patch_vault_brain(mock_brain, monkeypatch):
+    """Route VaultBrain.get() to the mock brain for every test in this module."""
+    monkeypatch.setattr("sidecar.vault_brain.VaultBrain.get", lambda: mock_brain)
+
+
+@pytest.fixture
+def plugin_instance(
+    smart_context_module, smart_context_plugin_cls, tmp_path, mock_brain, monkeypatch
+):
+    """Create an instance of the Smart Context plugin.
+
+    Embeddings are cached in memory; only the dedicated EmbeddingCache tests touch disk.
+    """
+    store = {}
+    monkeypatch.setattr(
+        smart_context_module, "EmbeddingCache", functools.partial(FakeEmbeddingCache, store)
+    )
+    plugin_dir = tmp_path / "smart_context"
+    plugin_dir.mkdir()
 
-    with patch("sidecar.vault_brain.VaultBrain.get", return_value=mock_brain):
-        plugin = smart_context_plugin_cls(plugin_dir, vault_path)
-    return plugin
+    return smart_context_plugin_cls(plugin_dir, tmp_path)
 
 
-@pytest.mark.asyncio
 class TestSmartContextPlugin:
     async def test_init(self, plugin_instance):
         """Test plugin initialization."""
@@ -69,65 +95,50 @@ class TestSmartContextPlugin:
     ):
         """Test that panel is registered when client connects."""
 
-        with patch("sidecar.vault_brain.VaultBrain.get", return_value=mock_brain):
-            await plugin_instance.on_client_connected()
+        await plugin_instance.on_client_connected()
 
-            # Check register_panel call (which emits UI_COMMAND)
-            # We check the calls to brain.emit_to_frontend
+        # Check register_panel call (which emits UI_COMMAND)
+        # We check the calls to brain.emit_to_frontend
+        emissions = emitted_actions(mock_brain.emit_to_frontend)
 
-            # Should have registered panel
-            register_call = None
-            set_content_call = None
+        # Should have registered panel
+        register_call = emissions.get(constants.UIAction.REGISTER_PANEL.value)
+        set_content_call = emissions.get(constants.UIAction.SET_PANEL.value)
 
-            for call in mock_brain.emit_to_frontend.call_args_list:
-                args, kwargs = call
-                data = kwargs.get("data", {})
-                if data.get("action") == constants.UIAction.REGISTER_PANEL.value:
-                    register_call = data
-                elif data.get("action") == constants.UIAction.SET_PANEL.value:
-                    set_content_call = data
+        assert register_call is not None
+        assert register_call["id"] == "smart-context-panel"
+        assert register_call["title"] == "Smart Context"
 
-            assert register_call is not None
-            assert register_call["id"] == "smart-context-panel"
-            assert register_call["title"] == "Smart Context"
-
-            # Should have set initial content
-            assert set_content_call is not None
-            assert set_content_call["id"] == "smart-context-panel"
-            assert "Waiting for context" in set_content_call["html"]
+        # Should have set initial content
+        assert set_content_call is not None
+        assert set_content_call["id"] == "smart-context-panel"
+        assert "Waiting for context" in set_content_call["html"]
 
     async def test_on_unload_removes_panel(self, plugin_instance, mock_brain):
         """Test that panel is removed when plugin unloads."""
 
-        with patch("sidecar.vault_brain.VaultBrain.get", return_value=mock_brain):
-            await plugin_instance.on_unload()
+        await plugin_instance.on_unload()
 
-            # Check remove_panel call
-            remove_call = None
-            for call in mock_brain.emit_to_frontend.call_args_list:
-                args, kwargs = call
-                data = kwargs.get("data", {})
-                if data.get("action") == constants.UIAction.REMOVE_PANEL.value:
-                    remove_call = data
+        # Check remove_panel call
+        remove_call = emitted_actions(mock_brain.emit_to_frontend).get(
+            constants.UIAction.REMOVE_PANEL.value
+        )
 
-            assert remove_call is not None
-            assert remove_call["id"] == "smart-context-panel"
+        assert remove_call is not None
+        assert remove_call["id"] == "smart-context-panel"
 
-    @pytest.mark.asyncio
     async def test_plugin_loads_config_defaults(self, plugin_instance):
         assert plugin_instance.similarity_threshold == 0.4
         assert plugin_instance.embedding_search is True
+        assert plugin_instance.min_history_for_filtering == 8
         assert plugin_instance.active_topics == set()
 
-    @pytest.mark.asyncio
     async def test_on_load_subscribes_to_pipeline_events(self, plugin_instance, mock_brain):
-        with patch("sidecar.vault_brain.VaultBrain.get", return_value=mock_brain):
-            await plugin_instance.on_load()
+        await plugin_instance.on_load()
         subscribed = [c[0][0] for c in mock_brain.subscribe.call_args_list]
         assert "pipeline.output" in subscribed
         assert "pipeline.context" in subscribed
 
-    @pytest.mark.asyncio
     async def test_extract_topics_parses_llm_response(self, plugin_instance, mock_brain):
         messages = [
             {"id": "a1b2", "role": "user", "content": "be concise"},
@@ -141,12 +152,11 @@ class TestSmartContextPlugin:
             "sticky_message_ids": ["a1b2"]
         })
 
-        with patch("sidecar.vault_brain.VaultBrain.get", return_value=mock_brain):
-            with patch("sidecar.services.llm_service.get_llm_service") as mock_get_llm:
-                mock_llm = MagicMock()
-                mock_llm.complete = AsyncMock(return_value=mock_response)
-                mock_get_llm.return_value = mock_llm
-                result = await plugin_instance._extract_topics(messages)
+        with patch("sidecar.services.llm_service.get_llm_service") as mock_get_llm:
+            mock_llm = MagicMock()
+            mock_llm.complete = AsyncMock(return_value=mock_response)
+            mock_get_llm.return_value = mock_llm
+            result = await plugin_instance._extract_topics(messages)
 
         labels = [t["label"] for t in result]
         assert "Python Async" in labels
@@ -155,7 +165,6 @@ class TestSmartContextPlugin:
         assert sticky["message_ids"] == ["a1b2"]
         assert sticky["count"] == 1
 
-    @pytest.mark.asyncio
     async def test_extract_topics_includes_existing_labels_in_user_message(self, plugin_instance, mock_brain):
         """When existing_topics are provided, their labels appear in the user content sent to the LLM."""
         messages = [
@@ -169,22 +178,20 @@ class TestSmartContextPlugin:
             "sticky_message_ids": []
         })
 
-        with patch("sidecar.vault_brain.VaultBrain.get", return_value=mock_brain):
-            with patch("sidecar.services.llm_service.get_llm_service") as mock_get_llm:
-                mock_llm = MagicMock()
-                mock_llm.complete = AsyncMock(return_value=mock_response)
-                mock_get_llm.return_value = mock_llm
-                await plugin_instance._extract_topics(messages, existing_topics=existing)
-
-                call_args = mock_llm.complete.call_args
-                user_msg = next(
-                    m["content"] for m in call_args.kwargs["messages"]
-                    if m["role"] == "user"
-                )
-                assert "Wimbledon" in user_msg
-                assert user_msg.startswith("Existing topics:")
-
-    @pytest.mark.asyncio
+        with patch("sidecar.services.llm_service.get_llm_service") as mock_get_llm:
+            mock_llm = MagicMock()
+            mock_llm.complete = AsyncMock(return_value=mock_response)
+            mock_get_llm.return_value = mock_llm
+            await plugin_instance._extract_topics(messages, existing_topics=existing)
+
+            call_args = mock_llm.complete.call_args
+            user_msg = next(
+                m["content"] for m in call_args.kwargs["messages"]
+                if m["role"] == "user"
+            )
+            assert "Wimbledon" in user_msg
+            assert user_msg.startswith("Existing topics:")
+
     async def test_on_pipeline_output_creates_extraction_task(self, plugin_instance, mock_brain):
         """_on_pipeline_output should fire _run_topic_extraction as background task."""
         ctx = PipelineContext(
@@ -203,7 +210,6 @@ class TestSmartContextPlugin:
         await asyncio.sleep(0)
         assert extraction_calls == ["chat_abc"]
 
-    @pytest.mark.asyncio
     async def test_on_pipeline_output_skips_when_no_response(self, plugin_instance):
         """_on_pipeline_output should do nothing when ctx.response is falsy."""
         ctx = PipelineContext(
@@ -220,23 +226,21 @@ class TestSmartContextPlugin:
         await asyncio.sleep(0)
         assert called == []
 
-    @pytest.mark.asyncio
     async def test_run_topic_extraction_saves_and_emits(self, plugin_instance, mock_brain):
         """_run_topic_extraction should load chat, extract topics, save, and emit."""
         messages = [{"id": "m1", "role": "user", "content": "How does async work?"}]
         extracted_topics = [{"label": "Python Async", "count": 1}]
 
-        mock_brain.execute_command = AsyncMock(return_value={
+        mock_brain.execute_command.return_value = {
             "status": "success",
             "data": {"messages": messages, "topics": []},
-        })
+        }
         plugin_instance._extract_topics = AsyncMock(return_value=extracted_topics)
 
         emitted = []
         plugin_instance.emit = lambda event, data: emitted.append((event, data))
 
-        with patch("sidecar.vault_brain.VaultBrain.get", return_value=mock_brain):
-            await plugin_instance._run_topic_extraction("chat_xyz")
+        await plugin_instance._run_topic_extraction("chat_xyz")
 
         assert plugin_instance.current_chat_id == "chat_xyz"
 
@@ -296,7 +300,6 @@ class TestSmartContextPlugin:
         assert by_label["Wimbledon"]["count"] == 2
         assert len([t for t in merged if not t.get("sticky")]) == 1
 
-    @pytest.mark.asyncio
     async def test_context_injection_passthrough_when_no_active_topics(self, plugin_instance, mock_brain):
         plugin_instance.active_topics = set()
         ctx = PipelineContext(message="hi", original_message="hi", metadata={})
@@ -304,10 +307,27 @@ class TestSmartContextPlugin:
         await plugin_instance._on_pipeline_context(ctx)
         assert len(ctx.history) == 1  # unchanged
 
-    @pytest.mark.asyncio
+    async def test_context_injection_skips_short_history(self, plugin_instance, mock_brain):
+        """Histories at or below the minimum are left whole without any embedding calls."""
+        plugin_instance.active_topics = {"Python Async"}
+        plugin_instance.min_history_for_filtering = 2
+        ctx = PipelineContext(message="q", original_message="q", metadata={"chat_id": "c1"})
+        ctx.history = [
+            {"id": "m1", "role": "user", "content": "How does async work in Python?"},
+            {"id": "m2", "role": "user", "content": "What is the capital of France?"},
+        ]
+
+        with patch("sidecar.services.llm_service.get_llm_service") as mock_get_llm:
+            await plugin_instance._on_pipeline_context(ctx)
+
+        assert len(ctx.history) == 2
+        mock_get_llm.assert_not_called()
+        mock_brain.execute_command.assert_not_called()
+
     async def test_context_injection_filters_by_similarity(self, plugin_instance, mock_brain):
         plugin_instance.active_topics = {"Python Async"}
         plugin_instance.embedding_search = True
+        plugin_instance.min_history_for_filtering = 0
         plugin_instance.similarity_threshold = 0.7
 
         ctx = PipelineContext(
@@ -319,28 +339,24 @@ class TestSmartContextPlugin:
             {"id": "m2", "role": "user", "content": "What is the capital of France?"},
         ]
 
-        with patch("sidecar.vault_brain.VaultBrain.get", return_value=mock_brain):
-            mock_brain.execute_command = AsyncMock(return_value={
-                "status": "success",
-                "data": {"messages": ctx.history, "topics": [{"label": "Python Async", "count": 1}]}
-            })
-            with patch("sidecar.services.llm_service.get_llm_service") as mock_get_llm:
-                mock_llm = MagicMock()
-                mock_llm.embed = AsyncMock(side_effect=[
-                    [[0.9, 0.1]],               # topic embedding
-                    [[0.85, 0.15], [0.1, 0.95]] # m1=similar, m2=dissimilar
-                ])
-                mock_get_llm.return_value = mock_llm
-                await plugin_instance._on_pipeline_context(ctx)
+        mock_brain.execute_command.return_value = {
+            "status": "success",
+            "data": {"messages": ctx.history, "topics": [{"label": "Python Async", "count": 1}]}
+        }
+        with patch("sidecar.services.llm_service.get_llm_service") as mock_get_llm:
+            mock_llm = MagicMock()
+            mock_llm.embed = AsyncMock(side_effect=iter([_TOPIC_EMBS, _MSG_EMBS]))
+            mock_get_llm.return_value = mock_llm
+            await plugin_instance._on_pipeline_context(ctx)
 
         assert len(ctx.history) == 1
         assert ctx.history[0]["id"] == "m1"
 
-    @pytest.mark.asyncio
     async def test_context_injection_always_includes_sticky(self, plugin_instance, mock_brain):
         """Sticky messages are kept even when their own cosine similarity is below threshold."""
         plugin_instance.active_topics = {"Python Async"}
         plugin_instance.embedding_search = True
+        plugin_instance.min_history_for_filtering = 0
         plugin_instance.similarity_threshold = 0.7
 
         ctx = PipelineContext(message="q", original_message="q", metadata={"chat_id": "c1"})
@@ -356,135 +372,230 @@ class TestSmartContextPlugin:
              "message_ids": ["sticky1"], "count": 1},
         ]}
 
-        with patch("sidecar.vault_brain.VaultBrain.get", return_value=mock_brain):
-            mock_brain.execute_command = AsyncMock(
-                return_value={"status": "success", "data": topics_data}
+        mock_brain.execute_command.return_value = {"status": "success", "data": topics_data}
+        with patch("sidecar.services.llm_service.get_llm_service") as mock_get_llm:
+            mock_llm = MagicMock()
+            # Topic embedding: [0.9, 0.1]
+            # sticky1 embedding: [0.0, 1.0] — orthogonal to topic, cosine ≈ 0.0 (below 0.7)
+            # m1 embedding: [0.85, 0.15] — similar to topic, cosine ≈ 0.99 (above 0.7)
+            # m2 embedding: [0.1, 0.95] — dissimilar to topic, cosine ≈ 0.15 (below 0.7)
+            mock_llm.embed = AsyncMock(
+                side_effect=iter([_TOPIC_EMBS, [_STICKY_EMB, *_MSG_EMBS]])  # sticky1, m1, m2
             )
-            with patch("sidecar.services.llm_service.get_llm_service") as mock_get_llm:
-                mock_llm = MagicMock()
-                # Topic embedding: [0.9, 0.1]
-                # sticky1 embedding: [0.0, 1.0] — orthogonal to topic, cosine ≈ 0.0 (below 0.7)
-                # m1 embedding: [0.85, 0.15] — similar to topic, cosine ≈ 0.99 (above 0.7)
-                # m2 embedding: [0.1, 0.95] — dissimilar to topic, cosine ≈ 0.15 (below 0.7)
-                mock_llm.embed = AsyncMock(side_effect=[
-                    [[0.9, 0.1]],                        # topic embedding
-                    [[0.0, 1.0], [0.85, 0.15], [0.1, 0.95]]  # sticky1, m1, m2
-                ])
-                mock_get_llm.return_value = mock_llm
-                await plugin_instance._on_pipeline_context(ctx)
+            mock_get_llm.return_value = mock_llm
+            await plugin_instance._on_pipeline_context(ctx)
 
         ids_in_history = {m["id"] for m in ctx.history}
         assert "sticky1" in ids_in_history  # kept via sticky logic despite low cosine
         assert "m1" in ids_in_history       # kept via similarity (cosine ≈ 0.99 >= 0.7)
         assert "m2" not in ids_in_history   # filtered out (cosine ≈ 0.15 < 0.7)
 
-    @pytest.mark.asyncio
+    async def test_topic_embeddings_reused_until_filter_changes(self, plugin_instance, mock_brain):
+        """Topic labels are embedded once; set_filter drops only deselected labels."""
+        plugin_instance.active_topics = {"Python Async"}
+        messages = [{"id": "m1", "role": "user", "content": "How does async work?"}]
+
+        with patch("sidecar.services.llm_service.get_llm_service") as mock_get_llm:
+            mock_llm = MagicMock()
+            # Topic, then m1 (cached afterwards)
+            mock_llm.embed = AsyncMock(side_effect=iter([_TOPIC_EMBS, _MSG_EMBS[:1]]))
+            mock_get_llm.return_value = mock_llm
+            await plugin_instance._compute_relevant_ids("c1", messages, set())
+            # Second pass: topic and message both come from cache
+            included = await plugin_instance._compute_relevant_ids("c1", messages, set())
+
+        assert included == ["m1"]
+        assert mock_llm.embed.await_count == 2
+
+        await plugin_instance.set_filter(topics=["Python Async", "LangGraph"])
+        assert set(plugin_instance._topic_embeddings) == {"Python Async"}
+        await plugin_instance.set_filter(topics=["LangGraph"])
+        assert plugin_instance._topic_embeddings == {}
+
+    @pytest.mark.parametrize("new_topics", [["LangGraph"], []])
+    async def test_filter_change_during_embedding(self, plugin_instance, mock_brain, new_topics):
+        """A filter change while embeddings are pending doesn't break the running pass."""
+        plugin_instance.active_topics = {"Python Async"}
+        plugin_instance.similarity_threshold = 0.7
+        messages = [
+            {"id": "m1", "role": "user", "content": "How does async work?"},
+            {"id": "m2", "role": "user", "content": "Tell me about cooking"},
+        ]
+
+        async def embed(texts):
+            if texts == ["Python Async"]:
+                await plugin_instance.set_filter(topics=new_topics)
+                return _TOPIC_EMBS
+            return _MSG_EMBS
+
+        with patch("sidecar.services.llm_service.get_llm_service") as mock_get_llm:
+            mock_get_llm.return_value = MagicMock(embed=embed)
+            included = await plugin_instance._compute_relevant_ids("c1", messages, set())
+
+        # Ranked against the topics active when the pass started
+        assert included == ["m1"]
+        # The deselected label isn't cached for later passes
+        assert plugin_instance._topic_embeddings == {}
+
     async def test_context_injection_fallback_when_threshold_met_by_nothing(self, plugin_instance, mock_brain):
         """If nothing passes threshold (excluding sticky), return full history."""
         plugin_instance.active_topics = {"Exotic Topic"}
         plugin_instance.embedding_search = True
+        plugin_instance.min_history_for_filtering = 0
         plugin_instance.similarity_threshold = 0.99
 
         ctx = PipelineContext(message="q", original_message="q", metadata={"chat_id": "c1"})
         original_history = [{"id": "m1", "role": "user", "content": "hello"}]
         ctx.history = original_history.copy()
 
-        with patch("sidecar.vault_brain.VaultBrain.get", return_value=mock_brain):
-            mock_brain.execute_command = AsyncMock(return_value={
-                "status": "success",
-                "data": {"messages": original_history, "topics": []}
-            })
-            with patch("sidecar.services.llm_service.get_llm_service") as mock_get_llm:
-                mock_llm = MagicMock()
-                mock_llm.embed = AsyncMock(side_effect=[[[1.0, 0.0]], [[0.1, 0.9]]])
-                mock_get_llm.return_value = mock_llm
-                await plugin_instance._on_pipeline_context(ctx)
+        mock_brain.execute_command.return_value = {
+            "status": "success",
+            "data": {"messages": original_history, "topics": []}
+        }
+        with patch("sidecar.services.llm_service.get_llm_service") as mock_get_llm:
+            mock_llm = MagicMock()
+            mock_llm.embed = AsyncMock(side_effect=iter([[[1.0, 0.0]], [[0.1, 0.9]]]))
+            mock_get_llm.return_value = mock_llm
+            await plugin_instance._on_pipeline_context(ctx)
 
         assert len(ctx.history) == 1  # full history preserved
 
-    @pytest.mark.asyncio
     async def test_set_filter_updates_active_topics_and_emits(self, plugin_instance, mock_brain):
-        with patch("sidecar.vault_brain.VaultBrain.get", return_value=mock_brain):
-            result = await plugin_instance.set_filter(topics=["Python Async", "LangGraph"])
+        result = await plugin_instance.set_filter(topics=["Python Async", "LangGraph"])
         assert plugin_instance.active_topics == {"Python Async", "LangGraph"}
         assert result["status"] == "success"
         mock_brain.emit_to_frontend.assert_called()
 
-    @pytest.mark.asyncio
     async def test_set_filter_empty_clears(self, plugin_instance, mock_brain):
         plugin_instance.active_topics = {"Python Async"}
-        with patch("sidecar.vault_brain.VaultBrain.get", return_value=mock_brain):
-            await plugin_instance.set_filter(topics=[])
+        await plugin_instance.set_filter(topics=[])
         assert plugin_instance.active_topics == set()
 
-    @pytest.mark.asyncio
     async def test_get_topics_reads_from_chat_file(self, plugin_instance, mock_brain):
-        mock_brain.execute_command = AsyncMock(return_value={
+        mock_brain.execute_command.return_value = {
             "status": "success",
             "data": {
                 "messages": [{"id": "1"}],
                 "topics": [{"label": "Python", "count": 3}]
             }
-        })
-        with patch("sidecar.vault_brain.VaultBrain.get", return_value=mock_brain):
-            result = await plugin_instance.get_topics(chat_id="chat_123")
+        }
+        result = await plugin_instance.get_topics(chat_id="chat_123")
         assert result["status"] == "success"
         assert result["topics"][0]["label"] == "Python"
         assert result["total_messages"] == 1
 
-    @pytest.mark.asyncio
     async def test_set_similarity_mode_toggles(self, plugin_instance, mock_brain):
         plugin_instance.embedding_search = True
         plugin_instance.active_topics = {"Python Async"}
-        with patch("sidecar.vault_brain.VaultBrain.get", return_value=mock_brain):
-            result = await plugin_instance.set_similarity_mode(enabled=False)
+        result = await plugin_instance.set_similarity_mode(enabled=False)
         assert plugin_instance.embedding_search is False
         assert plugin_instance.active_topics == set()  # cleared on disable
         assert result["status"] == "success"
         mock_brain.emit_to_frontend.assert_called()  # filter_changed emitted
 
-    @pytest.mark.asyncio
     async def test_on_client_connected_loads_panel_html_when_exists(self, plugin_instance, mock_brain):
         (plugin_instance.plugin_dir / "panel.html").write_text("<div id='sc-panel'>test</div>")
-        with patch("sidecar.vault_brain.VaultBrain.get", return_value=mock_brain):
-            await plugin_instance.on_client_connected()
-        set_calls = [
-            c for c in mock_brain.emit_to_frontend.call_args_list
-            if c.kwargs.get("data", {}).get("action") == "set_panel"
-        ]
-        assert any("sc-panel" in c.kwargs["data"]["html"] for c in set_calls)
+        await plugin_instance.on_client_connected()
+        assert "sc-panel" in emitted_actions(mock_brain.emit_to_frontend)["set_panel"]["html"]
 
 
-def _load_embedding_cache():
-    base = Path(__file__).resolve().parent.parent.parent
-    spec = importlib.util.spec_from_file_location(
-        "embedding_cache",
-        base / "example-vault/plugins/smart_context/embedding_cache.py"
-    )
-    mod = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(mod)
-    return mod.EmbeddingCache
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_max_similarities_matches_pairwise_cosine(smart_context_module, monkeypatch, use_numpy):
+    """Vectorized and pure-Python paths agree, including zero vectors."""
+    if use_numpy and smart_context_module._load_numpy() is None:
+        pytest.skip("numpy not installed")
+    monkeypatch.setattr(smart_context_module, "NUMPY_AVAILABLE", use_numpy)
+
+    embeddings = [[0.85, 0.15], [0.1, 0.95], [0.0, 0.0]]
+    topics = [[0.9, 0.1], [0.0, 1.0]]
+    result = smart_context_module._max_similarities(embeddings, topics)
+
+    def cosine(a, b):
+        norm = math.hypot(*a) * math.hypot(*b)
+        return sum(x * y for x, y in zip(a, b)) / norm if norm else 0.0
+
+    expected = [max(cosine(e, t) for t in topics) for e in embeddings]
+    assert result == pytest.approx(expected, abs=1e-6)
+    assert smart_context_module._max_similarities([], topics) == []
+
+
+@pytest.fixture(scope="session")
+def embedding_cache_cls(smart_context_module):
+    """The EmbeddingCache class, as imported once by the plugin module."""
+    return smart_context_module.EmbeddingCache
 
-def test_embedding_cache_miss_returns_none(tmp_path):
-    EmbeddingCache = _load_embedding_cache()
-    cache = EmbeddingCache(tmp_path, "chat_abc")
+
+def test_embedding_cache_miss_returns_none(tmp_path, embedding_cache_cls):
+    cache = embedding_cache_cls(tmp_path, "chat_abc")
     assert cache.get("msg1", "hello world") is None
 
-def test_embedding_cache_stores_and_retrieves(tmp_path):
-    EmbeddingCache = _load_embedding_cache()
-    cache = EmbeddingCache(tmp_path, "chat_abc")
+def test_embedding_cache_stores_and_retrieves(tmp_path, embedding_cache_cls):
+    cache = embedding_cache_cls(tmp_path, "chat_abc")
     cache.set("msg1", "hello world", [0.1, 0.2, 0.3])
-    assert cache.get("msg1", "hello world") == [0.1, 0.2, 0.3]
+    # Stored at half precision
+    assert cache.get("msg1", "hello world") == pytest.approx([0.1, 0.2, 0.3], abs=1e-3)
 
-def test_embedding_cache_persists_across_instances(tmp_path):
-    EmbeddingCache = _load_embedding_cache()
-    cache = EmbeddingCache(tmp_path, "chat_abc")
+def test_embedding_cache_persists_across_instances(tmp_path, embedding_cache_cls):
+    cache = embedding_cache_cls(tmp_path, "chat_abc")
     cache.set("msg1", "text", [1.0, 2.0])
     cache.save()
-    assert EmbeddingCache(tmp_path, "chat_abc").get("msg1", "text") == [1.0, 2.0]
+    assert embedding_cache_cls(tmp_path, "chat_abc").get("msg1", "text") == [1.0, 2.0]
+
+@pytest.mark.parametrize("use_xxhash", [True, False])
+def test_embedding_cache_migrates_legacy_json(
+    tmp_path, embedding_cache_cls, monkeypatch, use_xxhash
+):
+    """A JSON cache from earlier versions is replaced by the binary file.
+
+    Its md5-keyed entries carry over only while md5 is still the key function.
+    """
+    cache_module = sys.modules[embedding_cache_cls.__module__]
+    if use_xxhash and not cache_module.XXHASH_AVAILABLE:
+        pytest.skip("xxhash not installed")
+    monkeypatch.setattr(cache_module, "XXHASH_AVAILABLE", use_xxhash)
+    # Keyed as earlier versions did
+    key = "msg1:" + hashlib.md5(b"text").hexdigest()[:8]
+    legacy = tmp_path / "chat_abc.embeddings.json"
+    legacy.write_text(json.dumps({key: [1.0, 2.0]}))
+
+    cache = embedding_cache_cls(tmp_path, "chat_abc")
+    expected = None if use_xxhash else [1.0, 2.0]
+    assert cache.get("msg1", "text") == expected
+    cache.save()
+    assert not legacy.exists()
+    reloaded = embedding_cache_cls(tmp_path, "chat_abc")
+    assert reloaded.get("msg1", "text") == expected
+    assert list(reloaded._data) == ([] if use_xxhash else [key])
+
+
+def test_embedding_cache_ignores_corrupt_file(tmp_path, embedding_cache_cls):
+    (tmp_path / "chat_abc.embeddings.bin").write_bytes(b"not a cache")
+    assert embedding_cache_cls(tmp_path, "chat_abc").get("msg1", "text") is None
 
-def test_embedding_cache_content_change_is_cache_miss(tmp_path):
-    EmbeddingCache = _load_embedding_cache()
-    cache = EmbeddingCache(tmp_path, "chat_abc")
+
+@pytest.mark.parametrize("cut", [1, 3, 7])
+def test_embedding_cache_ignores_truncated_file(tmp_path, embedding_cache_cls, cut):
+    """A cut-off cache file loads as empty rather than failing later in get()."""
+    cache = embedding_cache_cls(tmp_path, "chat_abc")
+    cache.set("msg1", "text", [1.0, 2.0])
+    cache.set("msg2", "more", [3.0, 4.0])
+    cache.save()
+    path = tmp_path / "chat_abc.embeddings.bin"
+    path.write_bytes(path.read_bytes()[:-cut])
+
+    cache = embedding_cache_cls(tmp_path, "chat_abc")
+    assert cache.get("msg1", "text") is None
+    assert cache.get("msg2", "more") is None
+
+
+@pytest.mark.parametrize("use_xxhash", [True, False])
+def test_embedding_cache_content_change_is_cache_miss(
+    tmp_path, embedding_cache_cls, monkeypatch, use_xxhash
+):
+    cache_module = sys.modules[embedding_cache_cls.__module__]
+    if use_xxhash and not cache_module.XXHASH_AVAILABLE:
+        pytest.skip("xxhash not installed")
+    monkeypatch.setattr(cache_module, "XXHASH_AVAILABLE", use_xxhash)
+    cache = embedding_cache_cls(tmp_path, "chat_abc")
     cache.set("msg1", "original", [0.1, 0.2])
     assert cache.get("msg1", "modified") is None
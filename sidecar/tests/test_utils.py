@@ -2,6 +2,8 @@
 Tests for Utilities.
 """
 
+import json
+
 import pytest
 from sidecar import utils, exceptions
 
@@ -50,6 +52,27 @@ def test_validate_jsonrpc_message_invalid():
         )
 
 
+# JSON Serialization Tests
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_loads_round_trip(monkeypatch, use_orjson):
+    if use_orjson and not utils.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(utils, "ORJSON_AVAILABLE", use_orjson)
+
+    message = utils.build_request("test", {"a": 1, "text": "héllo"}, request_id="1")
+    encoded = utils.dumps(message)
+
+    assert isinstance(encoded, str)
+    assert json.loads(encoded) == message
+    assert utils.loads(encoded) == message
+    assert utils.loads(encoded.encode("utf-8")) == message
+    # Non-str keys are stringified like json.dumps does
+    assert utils.loads(utils.dumps({1: "x"})) == {"1": "x"}
+
+    with pytest.raises(json.JSONDecodeError):
+        utils.loads("not valid json")
+
+
 # Path Tests
 def test_validate_vault_path(tmp_path):
     # Valid
@@ -4,109 +4,205 @@ Unit tests for VaultBrain module.
 Tests initialization, plugin loading, and command registration.
 """
 
+import asyncio
+import shutil
+import tomllib
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
 import pytest
-from unittest.mock import Mock, patch, MagicMock, AsyncMock
+from unittest.mock import Mock, patch
 from pathlib import Path
 
-from sidecar.vault_brain import VaultBrain
 from sidecar import exceptions
 from sidecar import constants
+from sidecar.api.plugin_base import PluginBase
+
+if TYPE_CHECKING:
+    from sidecar.vault_brain import VaultBrain
+
+
+@pytest.fixture(scope="module")
+def vault_brain_cls(vault_brain_mod):
+    """VaultBrain, imported on first use rather than at collection time."""
+    return vault_brain_mod.VaultBrain
+
+
+@pytest.fixture(scope="module")
+def vault_template(tmp_path_factory):
+    """An empty vault built once; tests get their own copy via ``copytree``."""
+    vault_path = tmp_path_factory.mktemp("vault_template")
+    (vault_path / ".vault.toml").write_text("")
+    return vault_path
+
+
+@pytest.fixture(scope="module")
+def valid_vault_readonly(tmp_path_factory, vault_template):
+    """One vault for tests that never modify it (``.vault.toml`` or plugins)."""
+    root = tmp_path_factory.mktemp("readonly")
+    return Path(shutil.copytree(vault_template, root / "test_vault"))
+
+
+def _ws_server_stub():
+    """A disconnected stand-in for WebSocketServer; no test asserts on its calls."""
+    return SimpleNamespace(
+        command_handlers={}, is_connected=lambda: False, send_to_rust=lambda msg: None
+    )
+
+
+class InProcessPluginLoader:
+    """A ``VaultBrain._plugin_loader`` serving Plugin classes from a dict.
+
+    Keyed by plugin directory name, so it also answers the timestamped module
+    names ``reload_plugin`` asks for. Nothing is imported from disk.
+    """
+
+    def __init__(self, classes):
+        self.classes = dict(classes)
+        self.requested = []
+
+    def __call__(self, module_name, main_file):
+        plugin_name = main_file.parent.name
+        self.requested.append(plugin_name)
+        if plugin_name not in self.classes:
+            raise exceptions.PluginLoadError(plugin_name, "Not registered with the test loader")
+        return self.classes[plugin_name]
+
+
+@dataclass
+class BrainCtx:
+    """Everything a test needs to build its own VaultBrain.
+
+    The singleton itself is reset around every test by the conftest autouse
+    fixture, so there is nothing to tear down here.
+    """
+
+    vault: Path
+    ws_server: Any
+    brain_cls: type
+
+    def new_brain(self) -> "VaultBrain":
+        return self.brain_cls(self.vault, self.ws_server)
+
+
+def recording_hook(calls):
+    """Return a coroutine function that appends each call's arguments to ``calls``."""
+
+    async def hook(*args, **kwargs):
+        calls.append((args, kwargs))
+
+    return hook
+
+
+@pytest.fixture
+def make_mock_plugin():
+    """Return a factory building ``(plugin_class, plugin_instance)`` mocks.
+
+    The instance carries the PluginBase hooks VaultBrain calls while loading,
+    activating and unloading. Awaited hooks record into ``on_load_calls`` and
+    ``on_unload_calls``; pass ``on_tick`` to use a real coroutine function.
+    """
+
+    def _make(on_tick=None):
+        instance = Mock()
+        instance.register_commands = Mock()
+        instance.on_load_calls, instance.on_unload_calls = [], []
+        instance.on_load = recording_hook(instance.on_load_calls)
+        instance.on_unload = recording_hook(instance.on_unload_calls)
+        if on_tick is not None:
+            instance.on_tick = on_tick
+        return Mock(return_value=instance), instance
+
+    return _make
+
+
+@pytest.fixture(scope="class")
+async def _shared_brain(valid_vault_readonly, vault_brain_cls):
+    """An initialized brain, built once per requesting class."""
+    brain = vault_brain_cls(valid_vault_readonly, _ws_server_stub())
+    await brain.initialize()
+    return brain
 
 
 @pytest.mark.unit
+@pytest.mark.xdist_group(name="vault_brain_lifecycle")
 class TestVaultBrain:
     """Test VaultBrain functionality."""
 
     @pytest.fixture
-    def mock_ws_server(self):
-        """Create a mock WebSocketServer."""
-        return Mock()
+    def ws_server(self):
+        """Create a stub WebSocketServer."""
+        return _ws_server_stub()
 
-    @pytest.fixture(autouse=True)
-    def reset_singleton(self):
-        """Reset VaultBrain singleton before and after each test."""
-        VaultBrain._instance = None
-        yield
-        VaultBrain._instance = None
+    @pytest.fixture
+    def brain_ctx(self, tmp_path, vault_template, vault_brain_cls):
+        """A per-test vault the test may write config or plugins into, plus a ws stub."""
+        vault = Path(shutil.copytree(vault_template, tmp_path / "test_vault"))
+        return BrainCtx(vault, _ws_server_stub(), vault_brain_cls)
 
     @pytest.fixture
-    def valid_vault(self, tmp_path):
-        """Create a valid vault structure."""
-        vault_path = tmp_path / "test_vault"
-        vault_path.mkdir()
-        (vault_path / ".vault.toml").write_text("")
-        return vault_path
-
-    @pytest.mark.asyncio
-    async def test_init_valid_vault(self, valid_vault, mock_ws_server):
+    def initialized_brain(self, _shared_brain, vault_brain_cls):
+        """The class-wide initialized brain, reinstated as the singleton.
+
+        Config loading, plugin discovery and core command registration run once
+        per class. The autouse reset clears ``_instance`` before every test, so
+        point it back at the shared brain, and restore ``commands`` afterwards
+        so commands a test registers don't leak into the next one.
+        """
+        vault_brain_cls._instance = _shared_brain
+        commands = _shared_brain.commands.copy()
+        yield _shared_brain
+        _shared_brain.commands.clear()
+        _shared_brain.commands.update(commands)
+
+    async def test_init_valid_vault(self, initialized_brain, valid_vault_readonly):
         """Test initialization with a valid vault."""
+        brain = initialized_brain
 
-        brain = VaultBrain(valid_vault, mock_ws_server)
-        await brain.initialize()
-
-        assert brain.vault_path == valid_vault.resolve()
-        assert brain.ws_server == mock_ws_server
+        assert brain.vault_path == valid_vault_readonly.resolve()
+        assert brain.ws_server.command_handlers == {}
         # Core commands are registered in initialize
         assert len(brain.commands) >= 3
 
-    def test_init_nonexistent_vault(self, mock_ws_server):
+    def test_init_nonexistent_vault(self, vault_brain_cls):
         """Test initialization with nonexistent vault."""
         # Validation happens in __init__ (utils.validate_vault_path), so this remains sync check
         fake_path = Path("/nonexistent/path")
 
         with pytest.raises(exceptions.VaultNotFoundError):
-            VaultBrain(fake_path, mock_ws_server)
+            vault_brain_cls(fake_path, None)
 
-    @pytest.mark.asyncio
-    async def test_load_config_valid(self, valid_vault, mock_ws_server):
+    async def test_load_config_valid(self, initialized_brain):
         """Test loading valid configuration."""
-        brain = VaultBrain(valid_vault, mock_ws_server)
-        await brain.initialize()
-        assert isinstance(brain.config, dict)
+        assert isinstance(initialized_brain.config, dict)
 
-    @pytest.mark.asyncio
-    async def test_load_config_invalid_toml(self, valid_vault, mock_ws_server):
+    async def test_load_config_invalid_toml(self, brain_ctx):
         """Test loading invalid TOML configuration."""
-        (valid_vault / ".vault.toml").write_text("[invalid toml")
-
-        brain = VaultBrain(valid_vault, mock_ws_server)
+        (brain_ctx.vault / ".vault.toml").write_text("[invalid toml")
 
-        brain = VaultBrain(valid_vault, mock_ws_server)
+        brain = brain_ctx.new_brain()
 
         # Should not raise, but fall back to defaults
         await brain.initialize()
-        assert brain.config["name"] == valid_vault.name
-
-    @patch("sidecar.utils.validate_plugin_structure")
-    @patch("sidecar.vault_brain.importlib.util.spec_from_file_location")
-    @patch("sidecar.vault_brain.importlib.util.module_from_spec")
-    @pytest.mark.asyncio
-    async def test_load_plugins(
-        self, mock_module, mock_spec, mock_validate, valid_vault, mock_ws_server
-    ):
-        """Test loading plugins."""
-        # Mock discovered plugin path by ensuring it exists in the valid_vault
-        plugin_path = valid_vault / "plugins" / "test_plugin"
-        # mock_discover.return_value = [plugin_path] -> We rely on filesystem now or need to mock get_plugins_dir if we want to isolate
-        # The test actually creates the directories later, so standard discovery should work if we create files BEFORE initialize
+        assert brain.config["name"] == brain_ctx.vault.name
+
+    def test_load_config_missing_file(self, brain_ctx):
+        """Without a .vault.toml the brain falls back to the default config."""
+        (brain_ctx.vault / ".vault.toml").unlink()
 
-        # Mock plugin module and class
-        mock_plugin_instance = Mock()
-        # PluginBase mocks
-        mock_plugin_instance.register_commands = Mock()
-        mock_plugin_instance.on_load = AsyncMock()
+        config = brain_ctx.new_brain()._load_config()
 
-        mock_plugin_class = Mock(return_value=mock_plugin_instance)
+        assert config["name"] == brain_ctx.vault.name
+        assert config["id"] == str(brain_ctx.vault.resolve())
 
-        # Create a mock module with the plugin class
-        mock_mod = MagicMock()
-        setattr(mock_mod, "Plugin", mock_plugin_class)
-        mock_module.return_value = mock_mod
+    async def test_load_plugins(self, brain_ctx, make_mock_plugin):
+        """Test loading plugins."""
+        # Discovery and settings.json still come from disk; only the import step
+        # is swapped out via brain._plugin_loader
+        plugin_path = brain_ctx.vault / "plugins" / "test_plugin"
 
-        # Mock spec loader
-        mock_spec_obj = Mock()
-        mock_spec_obj.loader.exec_module = Mock()
-        mock_spec.return_value = mock_spec_obj
+        mock_plugin_class, mock_plugin_instance = make_mock_plugin()
 
         # Connect paths
         plugin_path.mkdir(parents=True, exist_ok=True)
@@ -116,7 +212,8 @@ class TestVaultBrain:
             '{"enabled": true, "key": "value"}'
         )  # plugin defaults still use settings.json
 
-        brain = VaultBrain(valid_vault, mock_ws_server)
+        brain = brain_ctx.new_brain()
+        brain._plugin_loader = InProcessPluginLoader({"test_plugin": mock_plugin_class})
         await brain.initialize()
 
         # Verify plugin loaded
@@ -128,36 +225,22 @@ class TestVaultBrain:
         call_kwargs = mock_plugin_class.call_args.kwargs
         assert call_kwargs["config"] == {"enabled": True, "key": "value"}
         mock_plugin_instance.register_commands.assert_called_once()
-        mock_plugin_instance.on_load.assert_called_once()
+        assert len(mock_plugin_instance.on_load_calls) == 1
 
-    @pytest.mark.asyncio
-    async def test_register_commands_via_plugins(self, valid_vault, mock_ws_server):
+    async def test_register_commands_via_plugins(self, initialized_brain):
         """Test command registration from plugins flows through initialize."""
-        # This is strictly integration logic usually, but here we can test
-        # specifically if register_commands is called on a mocked plugin.
-
-        brain = VaultBrain(valid_vault, mock_ws_server)
-
-        mock_plugin = Mock()
-        mock_plugin.register_commands = Mock()
-        mock_plugin.on_load = AsyncMock()
-
-        # Inject plugin manually to simulate "loaded" state if we skip initialize() logic,
-        # but here we want to test that initialize CALLS it.
-        # See test_load_plugins above for that.
+        # That initialize() calls register_commands on each plugin is covered by
+        # test_load_plugins above; here we check the core commands it registers.
+        assert "system.chat" in initialized_brain.commands
 
-        # If testing Register Core Commands:
-        await brain.initialize()
-        assert "system.chat" in brain.commands
-
-    @pytest.mark.asyncio
-    async def test_tick_event_subscription(self, valid_vault, mock_ws_server):
+    async def test_tick_event_subscription(
+        self, valid_vault_readonly, ws_server, make_mock_plugin, vault_brain_cls
+    ):
         """Test that plugins are auto-subscribed to TICK event."""
-        brain = VaultBrain(valid_vault, mock_ws_server)
+        brain = vault_brain_cls(valid_vault_readonly, ws_server)
 
-        mock_plugin = Mock()
-        mock_plugin.on_load = AsyncMock()
-        mock_plugin.on_tick = AsyncMock()  # Async tick
+        tick_calls = []
+        _, mock_plugin = make_mock_plugin(on_tick=recording_hook(tick_calls))
 
         # Manually add plugin to verify subscription logic in _activate_plugins
         brain.plugins["test_plugin"] = mock_plugin
@@ -169,47 +252,142 @@ class TestVaultBrain:
         # Verify subscription - accessing EventBus internals
         assert constants.CoreEvents.TICK in brain.events._subscribers
         # subscribers are list of (priority, handler) tuples
-        handlers = [h for p, h in brain.events._subscribers[constants.CoreEvents.TICK]]
-        assert mock_plugin.on_tick in handlers
+        assert any(
+            h is mock_plugin.on_tick
+            for _, h in brain.events._subscribers[constants.CoreEvents.TICK]
+        )
 
         # Verify publishing event calls the plugin
         await brain.publish(constants.CoreEvents.TICK)
-        mock_plugin.on_tick.assert_called_once()
+        assert len(tick_calls) == 1
+
+    async def test_only_implemented_hooks_are_wired(
+        self, valid_vault_readonly, ws_server, vault_brain_cls
+    ):
+        """Hooks left as PluginBase no-ops are neither subscribed nor awaited."""
+        brain = vault_brain_cls(valid_vault_readonly, ws_server)
+        connected = []
+
+        class ConnectOnly(PluginBase):
+            def register_commands(self):
+                pass
+
+            async def on_client_connected(self):
+                connected.append(self.name)
+
+        class Passive(ConnectOnly):
+            on_client_connected = PluginBase.on_client_connected
+
+        plugins_dir = valid_vault_readonly / "plugins"
+        brain.plugins["connect_only"] = ConnectOnly(
+            plugins_dir / "connect_only", valid_vault_readonly
+        )
+        brain.plugins["passive"] = Passive(plugins_dir / "passive", valid_vault_readonly)
+
+        await brain._activate_plugins()
+
+        assert not brain.events._subscribers.get(constants.CoreEvents.TICK)
+        assert list(brain._client_connected_hooks) == ["connect_only"]
+
+        await brain._client_ready_handler()
+        assert connected == ["connect_only"]
+
+    def test_emit_to_frontend_numbers_events(self, valid_vault_readonly, vault_brain_cls):
+        """Each frontend event goes out as a trigger_event with its own id."""
+        sent = []
+        ws_server = SimpleNamespace(
+            command_handlers={}, is_connected=lambda: True, send_to_rust=sent.append
+        )
+        brain = vault_brain_cls(valid_vault_readonly, ws_server)
+
+        brain.notify_frontend("hello")
+        brain.update_state("key", "value")
+
+        assert [m["method"] for m in sent] == ["trigger_event", "trigger_event"]
+        assert [m["id"] for m in sent] == ["evt_1", "evt_2"]
+        assert sent[1]["params"]["data"] == {"key": "key", "value": "value"}
+
+    async def test_emit_to_frontend_while_disconnected(
+        self, valid_vault_readonly, vault_brain_cls
+    ):
+        """Disconnected events are dropped unless persisted for client_ready."""
+        sent = []
+        connected = [False]
+        ws_server = SimpleNamespace(
+            command_handlers={},
+            is_connected=lambda: connected[0],
+            send_to_rust=sent.append,
+        )
+        brain = vault_brain_cls(valid_vault_readonly, ws_server)
+
+        brain.emit_to_frontend("dropped", {})
+        brain.emit_to_frontend("kept", {"n": 1}, persist=True)
+        assert sent == []
+
+        connected[0] = True
+        await brain._client_ready_handler()
+        await brain._client_ready_handler()
+
+        assert [m["params"]["event_type"] for m in sent] == ["kept"]
+
+    async def test_client_ready_without_ws_server(
+        self, valid_vault_readonly, vault_brain_cls
+    ):
+        """Persisted events stay queued when there is no server to replay to."""
+        brain = vault_brain_cls(valid_vault_readonly, None)
+        brain.emit_to_frontend("kept", {}, persist=True)
+
+        assert await brain._client_ready_handler() == {"status": "ok"}
+        assert len(brain._persisted_events) == 1
+
+    async def test_tick_loop_keeps_cadence(
+        self, valid_vault_readonly, vault_brain_cls, vault_brain_mod, monkeypatch
+    ):
+        """Tick handler time is absorbed into the next wait; big overruns skip ticks."""
+        interval = constants.DEFAULT_TICK_INTERVAL
+        clock = [100.0]
+        sleeps = []
+        handler_costs = iter([0.4 * interval, 2.5 * interval, 0.0])
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+            clock[0] += delay
+
+        async def fake_publish(event, **kwargs):
+            cost = next(handler_costs, None)
+            if cost is None:
+                raise asyncio.CancelledError
+            clock[0] += cost
+
+        monkeypatch.setattr(vault_brain_mod, "_monotonic", lambda: clock[0])
+        monkeypatch.setattr(vault_brain_mod, "_sleep", fake_sleep)
+        brain = vault_brain_cls(valid_vault_readonly, _ws_server_stub())
+        brain.publish = fake_publish
+
+        with pytest.raises(asyncio.CancelledError):
+            await brain.tick_loop()
+
+        assert sleeps == pytest.approx([interval, 0.6 * interval, interval])
 
     @patch("sidecar.vault_brain.importlib.invalidate_caches")
-    @patch("sidecar.vault_brain.importlib.util.spec_from_file_location")
-    @patch("sidecar.vault_brain.importlib.util.module_from_spec")
-    @pytest.mark.asyncio
     async def test_unload_and_reload_plugin(
-        self, mock_module, mock_spec, mock_invalidate, valid_vault, mock_ws_server
+        self, mock_invalidate, brain_ctx, make_mock_plugin
     ):
         """Test unloading and reloading a plugin."""
         # 1. Setup mock plugin
-        plugin_path = valid_vault / "plugins" / "test_hot_reload"
+        plugin_path = brain_ctx.vault / "plugins" / "test_hot_reload"
         plugin_path.mkdir(parents=True, exist_ok=True)
         (plugin_path / "main.py").touch()
         (plugin_path / "settings.json").write_text('{"enabled": true}')
         
-        mock_plugin_instance = Mock()
-        mock_plugin_instance.register_commands = Mock()
-        mock_plugin_instance.on_load = AsyncMock()
-        mock_plugin_instance.on_unload = AsyncMock()
-        
         # We need a bound method mock to test unsubscribe
         async def mock_tick(): pass
-        mock_plugin_instance.on_tick = mock_tick
-        
-        mock_plugin_class = Mock(return_value=mock_plugin_instance)
-        mock_mod = MagicMock()
-        setattr(mock_mod, "Plugin", mock_plugin_class)
-        mock_module.return_value = mock_mod
-        
-        mock_spec_obj = Mock()
-        mock_spec_obj.loader.exec_module = Mock()
-        mock_spec.return_value = mock_spec_obj
+        mock_plugin_class, mock_plugin_instance = make_mock_plugin(on_tick=mock_tick)
 
         # Initialize Brain and load plugin
-        brain = VaultBrain(valid_vault, mock_ws_server)
+        brain = brain_ctx.new_brain()
+        loader = InProcessPluginLoader({"test_hot_reload": mock_plugin_class})
+        brain._plugin_loader = loader
         await brain.initialize()
 
         assert "test_hot_reload" in brain.plugins
@@ -227,7 +405,7 @@ class TestVaultBrain:
         assert res_unload["status"] == "success"
         assert "test_hot_reload" not in brain.plugins
         assert "test.cmd" not in brain.commands
-        mock_plugin_instance.on_unload.assert_called_once()
+        assert len(mock_plugin_instance.on_unload_calls) == 1
         
         # Check event unsubscribe 
         # (Though we used a bound method mock, we'd need to verify EventBus state cleanly)
@@ -236,7 +414,7 @@ class TestVaultBrain:
         # Test Reload
         # ==========================================
         # Reset mocks
-        mock_plugin_instance.on_load.reset_mock()
+        mock_plugin_instance.on_load_calls.clear()
         mock_plugin_instance.register_commands.reset_mock()
         mock_invalidate.reset_mock()
         
@@ -245,39 +423,36 @@ class TestVaultBrain:
         assert res_reload["status"] == "success"
         assert "test_hot_reload" in brain.plugins
         mock_invalidate.assert_called_once()
-        mock_plugin_instance.on_load.assert_called_once()
+        assert len(mock_plugin_instance.on_load_calls) == 1
+        assert loader.requested == ["test_hot_reload", "test_hot_reload"]
 
 
-    @pytest.mark.asyncio
-    async def test_toggle_plugin_writes_valid_toml(self, valid_vault, mock_ws_server):
+    async def test_toggle_plugin_writes_valid_toml(self, brain_ctx):
         """toggle_plugin must write TOML, not JSON, to .vault.toml."""
-        import tomllib
-
-        brain = VaultBrain(valid_vault, mock_ws_server)
-        await brain.initialize()
+        # toggle_plugin re-reads .vault.toml itself, so initialize() isn't needed
+        brain = brain_ctx.new_brain()
 
         await brain.toggle_plugin(plugin_id="demo_plugin", enabled=True)
 
-        config_path = valid_vault / ".vault.toml"
+        config_path = brain_ctx.vault / ".vault.toml"
         # If this raises, the file was written as JSON (corruption bug)
-        with open(config_path, "rb") as f:
-            parsed = tomllib.load(f)
+        parsed = tomllib.loads(config_path.read_bytes().decode("utf-8"))
 
         assert parsed["plugins"]["demo_plugin"]["enabled"] is True
 
 
-    def test_singleton_reinit_is_guarded(self, valid_vault, mock_ws_server, tmp_path):
+    def test_singleton_reinit_is_guarded(
+        self, valid_vault_readonly, ws_server, vault_template, vault_brain_cls
+    ):
         """Calling VaultBrain.__init__ a second time must be a no-op."""
-        brain = VaultBrain(valid_vault, mock_ws_server)
+        brain = vault_brain_cls(valid_vault_readonly, ws_server)
         original_path = brain.vault_path
 
-        # Create a second distinct vault to pass to the re-init attempt
-        other_vault = tmp_path / "other_vault"
-        other_vault.mkdir()
-        (other_vault / ".vault.toml").write_text("")
+        # A second distinct vault to pass to the re-init attempt
+        other_vault = vault_template
 
         # Simulate __init__ being called again on the same instance
-        brain.__init__(other_vault, mock_ws_server)
+        brain.__init__(other_vault, None)
 
         # vault_path must be unchanged — re-init was a no-op
         assert brain.vault_path == original_path
@@ -285,46 +460,38 @@ class TestVaultBrain:
 
 
 
-    @pytest.mark.asyncio
-    async def test_register_command_no_override_raises(self, valid_vault, mock_ws_server):
-        """Registering a duplicate command with override=False must raise."""
-        brain = VaultBrain(valid_vault, mock_ws_server)
-        await brain.initialize()
-
-        async def handler_a(**kwargs): return {}
-        async def handler_b(**kwargs): return {}
-
-        brain.register_command("test.cmd", handler_a)
-
-        with pytest.raises(exceptions.CommandRegistrationError):
-            brain.register_command("test.cmd", handler_b, override=False)
-
-        assert brain.commands["test.cmd"]["handler"] is handler_a
-
-    @pytest.mark.asyncio
-    async def test_register_command_with_override_succeeds(self, valid_vault, mock_ws_server):
-        """Registering a duplicate command with override=True must succeed."""
-        brain = VaultBrain(valid_vault, mock_ws_server)
-        await brain.initialize()
+    @pytest.mark.parametrize(
+        "override,expect_raise,expected_handler",
+        [(False, True, "a"), (True, False, "b")],
+        ids=["no_override_raises", "with_override_succeeds"],
+    )
+    async def test_register_command_override_behavior(
+        self, initialized_brain, override, expect_raise, expected_handler
+    ):
+        """A duplicate command raises unless override=True, which replaces it."""
+        brain = initialized_brain
 
         async def handler_a(**kwargs): return {}
         async def handler_b(**kwargs): return {}
+        handlers = {"a": handler_a, "b": handler_b}
 
         brain.register_command("test.cmd", handler_a)
-        brain.register_command("test.cmd", handler_b, override=True)
-
-        assert brain.commands["test.cmd"]["handler"] is handler_b
 
+        if expect_raise:
+            with pytest.raises(exceptions.CommandRegistrationError):
+                brain.register_command("test.cmd", handler_b, override=override)
+        else:
+            brain.register_command("test.cmd", handler_b, override=override)
 
+        assert brain.commands["test.cmd"]["handler"] is handlers[expected_handler]
 
-    @pytest.mark.asyncio
-    async def test_legacy_plugin_config_logs_warning(self, valid_vault, mock_ws_server):
+    async def test_legacy_plugin_config_logs_warning(self, brain_ctx):
         """Non-dict plugin config entry must log a warning, not silently discard."""
-        (valid_vault / ".vault.toml").write_text(
+        (brain_ctx.vault / ".vault.toml").write_text(
             '[plugins]\nexplorer = ["legacy", "list"]\n'
         )
         # Create a minimal plugin directory so the loader reaches the config check
-        plugin_dir = valid_vault / "plugins" / "explorer"
+        plugin_dir = brain_ctx.vault / "plugins" / "explorer"
         plugin_dir.mkdir(parents=True)
         (plugin_dir / "main.py").write_text(
             """from sidecar.api.plugin_base import PluginBase
@@ -332,7 +499,7 @@ class Plugin(PluginBase):
     def register_commands(self): pass
 """
         )
-        brain = VaultBrain(valid_vault, mock_ws_server)
+        brain = brain_ctx.new_brain()
 
         with patch("sidecar.vault_brain.logger") as mock_logger:
             await brain.initialize()
@@ -342,26 +509,16 @@ class Plugin(PluginBase):
             )
 
 @pytest.mark.unit
+@pytest.mark.xdist_group(name="vault_brain_commands")
 class TestCommandRegistry:
     """Test command registry functionality."""
 
-    @pytest.fixture(autouse=True)
-    def reset_singleton(self):
-        """Reset VaultBrain singleton."""
-        VaultBrain._instance = None
-        yield
-        VaultBrain._instance = None
-
     @pytest.fixture
-    def brain(self, tmp_path):
+    def brain(self, valid_vault_readonly, vault_brain_cls):
         """Create a VaultBrain instance with mocks."""
-        vault_path = tmp_path / "test_vault"
-        vault_path.mkdir()
-        (vault_path / ".vault.toml").write_text("")
+        vault_path = valid_vault_readonly
 
-        ws_server = Mock()
-        ws_server.command_handlers = {}
-        brain = VaultBrain(vault_path, ws_server)
+        brain = vault_brain_cls(vault_path, _ws_server_stub())
         # We don't necessarily need full initialize for registry unit tests if we just use register_command directly
         return brain
 
@@ -385,7 +542,6 @@ class TestCommandRegistry:
         with pytest.raises(exceptions.CommandRegistrationError):
             brain.register_command("test.sync", sync_command)
 
-    @pytest.mark.asyncio
     async def test_execute_command_success(self, brain):
         """Test executing a registered command."""
 
@@ -397,7 +553,6 @@ class TestCommandRegistry:
         result = await brain.execute_command("test.cmd")
         assert result == "executed"
 
-    @pytest.mark.asyncio
     async def test_execute_command_with_args(self, brain):
         """Test executing a registered command with arguments."""
 
@@ -410,13 +565,11 @@ class TestCommandRegistry:
         result = await brain.execute_command("calc.add", a=5, b=3)
         assert result == 8
 
-    @pytest.mark.asyncio
     async def test_execute_command_not_found(self, brain):
         """Test executing a non-existent command."""
         with pytest.raises(exceptions.CommandNotFoundError):
             await brain.execute_command("non.existent")
 
-    @pytest.mark.asyncio
     async def test_execute_command_execution_error(self, brain):
         """Test handling of execution errors."""
 
@@ -470,8 +623,8 @@ class TestCommandRegistry:
             pass
 
         brain.subscribe("test.evt", handler)
-        # Check brain.events._subscribers
-        assert len(brain.events._subscribers["test.evt"]) == 1
+        # Check brain.events._subscribers: (priority, handler) at default priority
+        assert brain.events._subscribers["test.evt"] == ((0, handler),)
 
         brain.clear_subscribers("test.evt")
-        assert len(brain.events._subscribers["test.evt"]) == 0
+        assert not brain.events._subscribers["test.evt"]
@@ -4,8 +4,8 @@ Unit tests for WebSocketServer module.
 Tests connection handling, JSON-RPC message processing, and command registration.
 """
 
+import asyncio
 import pytest
-import json
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from sidecar.websocket_server import WebSocketServer
 from sidecar import exceptions
@@ -61,7 +61,7 @@ class TestWebSocketServer:
 
             request = utils.build_request("test.echo", {"msg": "hello"}, request_id="1")
 
-            await server.handle_message(json.dumps(request))
+            await server.handle_message(utils.dumps(request))
 
             # Check Brain called
             mock_brain.execute_command.assert_called_once_with("test.echo", msg="hello")
@@ -69,7 +69,7 @@ class TestWebSocketServer:
             # Check response sent
             server.connection.send.assert_called_once()
             response_str = server.connection.send.call_args[0][0]
-            response = json.loads(response_str)
+            response = utils.loads(response_str)
 
             assert response["result"] == {"status": "ok"}
             assert response["id"] == "1"
@@ -100,12 +100,12 @@ class TestWebSocketServer:
                 )
             },
         ):
-            await server.handle_message(json.dumps(request))
+            await server.handle_message(utils.dumps(request))
 
             # Verify method not found error sent
             server.connection.send.assert_called_once()
             response_str = server.connection.send.call_args[0][0]
-            response = json.loads(response_str)
+            response = utils.loads(response_str)
 
             assert "error" in response
             assert response["error"]["code"] == constants.JSONRPC_METHOD_NOT_FOUND
@@ -121,6 +121,53 @@ class TestWebSocketServer:
         # Should catch and log, probably no response back to client unless implemented?
         server.connection.send.assert_not_called()
 
+    async def test_handle_message_list_params(self, server):
+        """Array params are passed to the command as ``args``."""
+        mock_brain = MagicMock()
+        mock_brain.execute_command = AsyncMock(return_value=None)
+
+        with patch.dict(
+            "sys.modules",
+            {
+                "sidecar.vault_brain": MagicMock(
+                    VaultBrain=MagicMock(get=MagicMock(return_value=mock_brain))
+                )
+            },
+        ):
+            server.connection = Mock()
+            server.connection.send = AsyncMock()
+
+            request = utils.build_request("test.echo", [1, 2], request_id="4")
+            await server.handle_message(utils.dumps(request))
+
+            mock_brain.execute_command.assert_called_once_with("test.echo", args=[1, 2])
+
+    @pytest.mark.parametrize(
+        "message",
+        [
+            {"jsonrpc": "1.0", "method": "test.echo", "id": "5"},
+            {"jsonrpc": "2.0", "method": 5, "id": "5"},
+            {"jsonrpc": "2.0", "method": "test.echo", "params": None, "id": "5"},
+            {"jsonrpc": "2.0", "result": {}, "id": "5"},
+            [{"jsonrpc": "2.0", "method": "test.echo", "id": "5"}],
+            "test.echo",
+        ],
+    )
+    async def test_handle_message_not_dispatched(self, server, message):
+        """Invalid requests and responses never reach a command."""
+        server.connection = Mock()
+        server.connection.send = AsyncMock()
+
+        with (
+            patch.object(server, "_execute_request", AsyncMock()) as execute,
+            patch.object(server, "close") as close,
+        ):
+            await server.handle_message(utils.dumps(message))
+
+        execute.assert_not_called()
+        close.assert_not_called()
+        server.connection.send.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_handler_exception(self, server):
         """Test error raised inside handler."""
@@ -142,12 +189,12 @@ class TestWebSocketServer:
 
             request = utils.build_request("test.fail", request_id="3")
 
-            await server.handle_message(json.dumps(request))
+            await server.handle_message(utils.dumps(request))
 
             # Check internal error response
             server.connection.send.assert_called_once()
             response_str = server.connection.send.call_args[0][0]
-            response = json.loads(response_str)
+            response = utils.loads(response_str)
 
             assert response["error"]["code"] == constants.JSONRPC_INTERNAL_ERROR
             assert (
@@ -169,3 +216,127 @@ class TestWebSocketServer:
 
         # Should have set connection, then cleared it in finally block
         assert server.connection is None
+
+    async def test_writer_coalesces_queued_messages(self, server, mock_ws):
+        """Messages queued together go out as one JSON array frame."""
+        queue = asyncio.Queue()
+        for i in range(3):
+            queue.put_nowait(utils.build_response(i, request_id=str(i)))
+
+        writer = asyncio.create_task(server._writer(mock_ws, queue))
+        await asyncio.sleep(0)
+        writer.cancel()
+
+        mock_ws.send.assert_awaited_once()
+        frame = utils.loads(mock_ws.send.call_args[0][0])
+        assert [m["id"] for m in frame] == ["0", "1", "2"]
+
+    async def test_writer_sends_single_message_as_object(self, server, mock_ws):
+        """A lone queued message is sent unwrapped."""
+        queue = asyncio.Queue()
+        writer = asyncio.create_task(server._writer(mock_ws, queue))
+
+        await asyncio.sleep(0)  # writer is now waiting on the empty queue
+        queue.put_nowait(utils.build_response("ok", request_id="1"))
+        await asyncio.sleep(0)
+        writer.cancel()
+
+        frame = utils.loads(mock_ws.send.call_args[0][0])
+        assert frame == {"jsonrpc": "2.0", "result": "ok", "id": "1"}
+
+    async def test_send_enqueues_while_connected(self, server, mock_ws):
+        """During a connection, send() hands messages to the writer queue."""
+        server.connection = mock_ws
+        server._out_queue = asyncio.Queue()
+
+        await server.send(utils.build_response("ok", request_id="1"))
+
+        assert server._out_queue.qsize() == 1
+        mock_ws.send.assert_not_called()
+
+    def test_send_to_rust_without_connection_is_pending(self, server):
+        """With no client connected, messages wait in pending_messages."""
+        msg = utils.build_request("trigger_event", {"a": 1}, request_id="evt_1")
+        server.send_to_rust(msg)
+        assert list(server.pending_messages) == [msg]
+
+    def test_pending_messages_are_bounded(self, server):
+        """Without a connection only the newest pending messages are kept."""
+        limit = constants.WEBSOCKET_MAX_PENDING_MESSAGES
+        for i in range(limit + 2):
+            server.send_to_rust(utils.build_request("trigger_event", request_id=f"evt_{i}"))
+
+        assert len(server.pending_messages) == limit
+        assert server.pending_messages[0]["id"] == "evt_2"
+
+    async def test_pending_messages_flushed_on_connect(self, server, mock_ws):
+        """A new connection's writer sends what was queued while disconnected."""
+        server.send_to_rust(utils.build_request("trigger_event", request_id="evt_1"))
+        release = asyncio.Event()
+
+        async def hold_open():
+            await release.wait()
+            if False:
+                yield
+
+        mock_ws.__aiter__.side_effect = hold_open
+        connection = asyncio.create_task(server.handle_connection(mock_ws))
+        await asyncio.sleep(0)
+        server.send_to_rust(utils.build_request("trigger_event", request_id="evt_2"))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        release.set()
+        await connection
+
+        assert not server.pending_messages
+        sent = [utils.loads(c[0][0]) for c in mock_ws.send.call_args_list]
+        ids = [m["id"] for frame in sent for m in (frame if isinstance(frame, list) else [frame])]
+        assert ids == ["evt_1", "evt_2"]
+
+    async def test_undelivered_messages_kept_on_disconnect(self, server, mock_ws):
+        """Messages still queued when the connection ends wait for the next one."""
+
+        async def close_with_queued_messages():
+            server.send_to_rust(utils.build_request("trigger_event", request_id="evt_1"))
+            server.send_to_rust(utils.build_request("trigger_event", request_id="evt_2"))
+            if False:
+                yield
+
+        mock_ws.__aiter__.side_effect = close_with_queued_messages
+        await server.handle_connection(mock_ws)
+
+        assert [m["id"] for m in server.pending_messages] == ["evt_1", "evt_2"]
+        mock_ws.send.assert_not_called()
+
+    async def test_send_failure_keeps_messages_pending(self, server, mock_ws):
+        """After a failed send the batch and later messages go to pending_messages."""
+        server.send_to_rust(utils.build_request("trigger_event", request_id="evt_1"))
+        mock_ws.send.side_effect = ConnectionError("gone")
+        release = asyncio.Event()
+
+        async def hold_open():
+            await release.wait()
+            if False:
+                yield
+
+        mock_ws.__aiter__.side_effect = hold_open
+        connection = asyncio.create_task(server.handle_connection(mock_ws))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert server._out_queue is None
+        server.send_to_rust(utils.build_request("trigger_event", request_id="evt_2"))
+        release.set()
+        await connection
+
+        assert [m["id"] for m in server.pending_messages] == ["evt_1", "evt_2"]
+
+    def test_connection_queue_drops_oldest_when_full(self, server):
+        """A full writer queue keeps the newest messages."""
+        server._out_queue = asyncio.Queue(maxsize=2)
+        for i in range(3):
+            server.send_to_rust(utils.build_request("trigger_event", request_id=f"evt_{i}"))
+
+        ids = [server._out_queue.get_nowait()["id"] for _ in range(2)]
+        assert ids == ["evt_1", "evt_2"]
+
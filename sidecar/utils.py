@@ -4,22 +4,30 @@ Tailor - Utilities Module
 Consolidated utilities for the Sidecar application.
 Includes:
 - Logging Configuration
+- JSON Serialization
 - JSON-RPC Utilities
 - Path Utilities
 - ID Generation
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Union
 from pathlib import Path
+import inspect
+import json
 import os
 import sys
 import time
+from secrets import token_hex
 
-import random
-import string
 from . import constants
 from . import exceptions
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # =============================================================================
 # Logging Configuration
 # =============================================================================
@@ -72,6 +80,9 @@ def configure_logging(
                 level=log_level,
                 format=format_str,
                 encoding="utf-8",
+                # Write (and rotate) on loguru's worker thread so disk I/O
+                # never stalls the event loop; loguru drains it at exit
+                enqueue=True,
             )
 
             logger.info(f"Logging to file: {log_file}")
@@ -82,10 +93,39 @@ def configure_logging(
     logger.info(f"Logging configured at {log_level} level")
 
 
+# =============================================================================
+# JSON Serialization
+# =============================================================================
+
+
+def dumps(obj: Any) -> str:
+    """Serialize an object to a JSON string (orjson when installed)."""
+    if ORJSON_AVAILABLE:
+        # Non-str keys are stringified, matching json.dumps
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse a JSON string or bytes (orjson when installed).
+
+    Raises json.JSONDecodeError on invalid input; orjson's error subclasses it.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 # =============================================================================
 # JSON-RPC Utilities
 # =============================================================================
 
+# Bound once at import; the builders below run for every RPC message
+_JSONRPC_VERSION = constants.JSONRPC_VERSION
+_time_ns = time.time_ns
+_MISSING = object()
+
 
 def build_request(
     method: str,
@@ -93,19 +133,14 @@ def build_request(
     request_id: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Build a JSON-RPC 2.0 request message."""
-    message: Dict[str, Any] = {
-        "jsonrpc": constants.JSONRPC_VERSION,
-        "method": method,
-    }
+    message: Dict[str, Any] = {"jsonrpc": _JSONRPC_VERSION, "method": method}
 
     if params is not None:
         message["params"] = params
 
-    if request_id is None:
-        request_id = f"req_{int(time.time() * 1000)}"
-
-    message["id"] = request_id
-
+    message["id"] = (
+        request_id if request_id is not None else f"req_{_time_ns() // 1_000_000}"
+    )
     return message
 
 
@@ -114,11 +149,7 @@ def build_response(
     request_id: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Build a JSON-RPC 2.0 success response message."""
-    return {
-        "jsonrpc": constants.JSONRPC_VERSION,
-        "result": result,
-        "id": request_id,
-    }
+    return {"jsonrpc": _JSONRPC_VERSION, "result": result, "id": request_id}
 
 
 def build_error(
@@ -128,19 +159,12 @@ def build_error(
     request_id: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Build a JSON-RPC 2.0 error response message."""
-    error_obj = {
-        "code": code,
-        "message": message,
-    }
+    error_obj: Dict[str, Any] = {"code": code, "message": message}
 
     if data is not None:
         error_obj["data"] = data
 
-    return {
-        "jsonrpc": constants.JSONRPC_VERSION,
-        "error": error_obj,
-        "id": request_id,
-    }
+    return {"jsonrpc": _JSONRPC_VERSION, "error": error_obj, "id": request_id}
 
 
 def build_internal_error(
@@ -172,57 +196,71 @@ def build_method_not_found(
 
 def validate_jsonrpc_message(message: Dict[str, Any]) -> None:
     """Validate that a message conforms to JSON-RPC 2.0 spec."""
+    # Batches (arrays) and scalars are not single messages
+    if not isinstance(message, dict):
+        raise exceptions.JSONRPCError(
+            "Message must be an object", constants.JSONRPC_INVALID_REQUEST
+        )
+
+    # Each field is looked up once; _MISSING tells absent keys from None values
+    get = message.get
+    version = get("jsonrpc", _MISSING)
+    method = get("method", _MISSING)
+
     # Check jsonrpc version
-    if "jsonrpc" not in message:
+    if version is _MISSING:
         raise exceptions.JSONRPCError(
             "Missing 'jsonrpc' field", constants.JSONRPC_INVALID_REQUEST
         )
 
-    if message["jsonrpc"] != constants.JSONRPC_VERSION:
+    if version != _JSONRPC_VERSION:
         raise exceptions.JSONRPCError(
-            f"Invalid JSON-RPC version: {message['jsonrpc']}",
+            f"Invalid JSON-RPC version: {version}",
             constants.JSONRPC_INVALID_REQUEST,
         )
 
     # Check if it's a request or response
-    if "method" in message:
+    if method is not _MISSING:
         # Request validation
-        if not isinstance(message["method"], str):
+        if not isinstance(method, str):
             raise exceptions.JSONRPCError(
                 "Method must be a string", constants.JSONRPC_INVALID_REQUEST
             )
 
-        if "params" in message and not isinstance(message["params"], (dict, list)):
+        params = get("params", _MISSING)
+        if params is not _MISSING and not isinstance(params, (dict, list)):
             raise exceptions.JSONRPCError(
                 "Params must be object or array", constants.JSONRPC_INVALID_PARAMS
             )
+        return
 
-    elif "result" in message or "error" in message:
-        # Response validation
-        if "result" in message and "error" in message:
-            raise exceptions.JSONRPCError(
-                "Response cannot have both 'result' and 'error'",
-                constants.JSONRPC_INVALID_REQUEST,
-            )
-
-        if "error" in message:
-            error = message["error"]
-            if not isinstance(error, dict):
-                raise exceptions.JSONRPCError(
-                    "Error must be an object", constants.JSONRPC_INVALID_REQUEST
-                )
-
-            if "code" not in error or "message" not in error:
-                raise exceptions.JSONRPCError(
-                    "Error must have 'code' and 'message'",
-                    constants.JSONRPC_INVALID_REQUEST,
-                )
+    has_result = "result" in message
+    error = get("error", _MISSING)
 
-    else:
+    if not has_result and error is _MISSING:
         raise exceptions.JSONRPCError(
             "Message must be request or response", constants.JSONRPC_INVALID_REQUEST
         )
 
+    # Response validation
+    if has_result and error is not _MISSING:
+        raise exceptions.JSONRPCError(
+            "Response cannot have both 'result' and 'error'",
+            constants.JSONRPC_INVALID_REQUEST,
+        )
+
+    if error is not _MISSING:
+        if not isinstance(error, dict):
+            raise exceptions.JSONRPCError(
+                "Error must be an object", constants.JSONRPC_INVALID_REQUEST
+            )
+
+        if "code" not in error or "message" not in error:
+            raise exceptions.JSONRPCError(
+                "Error must have 'code' and 'message'",
+                constants.JSONRPC_INVALID_REQUEST,
+            )
+
 
 def get_request_id(message: Dict[str, Any]) -> Optional[str]:
     """Extract request ID from a JSON-RPC message."""
@@ -236,13 +274,17 @@ def get_method(message: Dict[str, Any]) -> Optional[str]:
 
 def get_params(message: Dict[str, Any]) -> Dict[str, Any]:
     """Extract params from a JSON-RPC request."""
-    params = message.get("params", {})
+    params = message.get("params")
+
+    # Object params (the common case) need no conversion
+    if isinstance(params, dict):
+        return params
 
-    # Convert list params to dict (some clients might send arrays)
+    # Handlers take params as keyword arguments, so arrays are wrapped
     if isinstance(params, list):
         return {"args": params}
 
-    return params if isinstance(params, dict) else {}
+    return {}
 
 
 # =============================================================================
@@ -257,10 +299,10 @@ def validate_vault_path(vault_path: Path) -> Path:
     except Exception as e:
         raise exceptions.InvalidPathError(str(vault_path), f"Cannot resolve path: {e}")
 
-    if not resolved_path.exists():
-        raise exceptions.VaultNotFoundError(str(vault_path))
-
+    # is_dir() is one stat; only a failure needs the second to pick the error
     if not resolved_path.is_dir():
+        if not resolved_path.exists():
+            raise exceptions.VaultNotFoundError(str(vault_path))
         raise exceptions.InvalidPathError(str(vault_path), "Path is not a directory")
 
     return resolved_path
@@ -268,23 +310,23 @@ def validate_vault_path(vault_path: Path) -> Path:
 
 def validate_plugin_structure(plugin_dir: Path) -> None:
     """Validate that a plugin directory has the required structure."""
-    if not plugin_dir.exists():
-        raise exceptions.PluginLoadError(
-            plugin_dir.name, f"Plugin directory does not exist: {plugin_dir}"
-        )
-
+    # As in validate_vault_path, a valid plugin costs one stat per check and
+    # only a failure needs exists() to pick the error
     if not plugin_dir.is_dir():
+        if not plugin_dir.exists():
+            raise exceptions.PluginLoadError(
+                plugin_dir.name, f"Plugin directory does not exist: {plugin_dir}"
+            )
         raise exceptions.PluginLoadError(
             plugin_dir.name, f"Plugin path is not a directory: {plugin_dir}"
         )
 
     main_file = plugin_dir / constants.PLUGIN_MAIN_FILE
-    if not main_file.exists():
-        raise exceptions.PluginLoadError(
-            plugin_dir.name, f"Plugin missing {constants.PLUGIN_MAIN_FILE}"
-        )
-
     if not main_file.is_file():
+        if not main_file.exists():
+            raise exceptions.PluginLoadError(
+                plugin_dir.name, f"Plugin missing {constants.PLUGIN_MAIN_FILE}"
+            )
         raise exceptions.PluginLoadError(
             plugin_dir.name, f"{constants.PLUGIN_MAIN_FILE} is not a file"
         )
@@ -294,12 +336,14 @@ def ensure_directory(path: Path, create: bool = True) -> Path:
     """Ensure a directory exists, optionally creating it."""
     resolved = path.resolve()
 
+    if resolved.is_dir():
+        return resolved
+
     if resolved.exists():
-        if not resolved.is_dir():
-            raise exceptions.InvalidPathError(
-                str(path), "Path exists but is not a directory"
-            )
-    elif create:
+        raise exceptions.InvalidPathError(
+            str(path), "Path exists but is not a directory"
+        )
+    if create:
         try:
             resolved.mkdir(parents=True, exist_ok=True)
         except Exception as e:
@@ -323,7 +367,49 @@ def get_memory_dir(vault_path: Path, create: bool = True) -> Path:
 def get_plugins_dir(vault_path: Path) -> Optional[Path]:
     """Get the plugins directory for a vault."""
     plugins_path = vault_path / constants.PLUGINS_DIR
-    return plugins_path if plugins_path.exists() and plugins_path.is_dir() else None
+    # is_dir() is False for missing paths too, so one stat covers both checks
+    return plugins_path if plugins_path.is_dir() else None
+
+
+def discover_plugins(plugins_dir: Path) -> List[Path]:
+    """
+    List plugin directories (those containing a main file), sorted by name.
+
+    Hidden and underscore-prefixed entries are skipped. Uses os.scandir so
+    the directory check comes from the cached entry type rather than a stat.
+    """
+    main_file = constants.PLUGIN_MAIN_FILE
+    with os.scandir(plugins_dir) as entries:
+        names = [
+            entry.name
+            for entry in entries
+            if not entry.name.startswith((".", "_"))
+            and entry.is_dir()
+            and os.path.exists(os.path.join(entry.path, main_file))
+        ]
+    names.sort()
+    return [plugins_dir / name for name in names]
+
+
+# =============================================================================
+# Introspection
+# =============================================================================
+
+_CO_COROUTINE = inspect.CO_COROUTINE
+
+
+def is_async_callable(func: Any) -> bool:
+    """
+    Check whether a handler is an ``async def`` function or method.
+
+    Plain functions and bound methods are answered from their code flags;
+    anything else (partials, marked callables) falls back to
+    inspect.iscoroutinefunction.
+    """
+    code = getattr(func, "__code__", None)
+    if code is not None and code.co_flags & _CO_COROUTINE:
+        return True
+    return inspect.iscoroutinefunction(func)
 
 
 # =============================================================================
@@ -334,10 +420,10 @@ def get_plugins_dir(vault_path: Path) -> Optional[Path]:
 def generate_id(prefix: str = "") -> str:
     """
     Generate a unique ID.
-    Uses a combination of timestamp and random characters.
+    Uses a combination of a millisecond timestamp and 8 random hex characters.
     """
-    timestamp = int(time.time() * 1000)
-    random_suffix = "".join(random.choices(string.ascii_lowercase + string.digits, k=6))
+    timestamp = _time_ns() // 1_000_000
+    random_suffix = token_hex(4)
 
     if prefix:
         return f"{prefix}{timestamp}_{random_suffix}"
@@ -6,14 +6,15 @@ Acts as the central Event/Command hub.
 """
 
 import asyncio
-import json
 import tomllib
 import tomli_w
 import importlib.util
+import itertools
 import time
 import inspect
+from collections import deque
 from pathlib import Path
-from typing import Dict, Any, Optional, Callable, Awaitable, List
+from typing import Deque, Dict, Any, Optional, Callable, Awaitable, List
 
 from . import utils
 from . import constants
@@ -26,9 +27,7 @@ from .plugin_installer import PluginInstaller
 from .services.keyring_service import get_keyring_service, PROVIDERS
 from .services.llm_service import LLMService
 from .event_bus import EventBus
-
-# Local import avoids circular dependency in type checking if used carefully
-# from .api.plugin_base import PluginBase
+from .api.plugin_base import PluginBase
 
 from loguru import logger
 
@@ -37,6 +36,45 @@ logger = logger.bind(name=__name__)
 # Type aliases
 CommandHandler = Callable[..., Awaitable[Any]]
 EventHandler = Callable[..., Awaitable[None]]
+PluginLoader = Callable[[str, Path], type]
+
+# Clock and sleep used by tick_loop; module-level so tests can swap them
+# without touching the stdlib modules the event loop itself relies on
+_monotonic = time.monotonic
+_sleep = asyncio.sleep
+
+
+def _import_plugin_class(module_name: str, main_file: Path) -> type:
+    """Execute a plugin's main.py as ``module_name`` and return its Plugin class."""
+    plugin_name = main_file.parent.name
+    spec = importlib.util.spec_from_file_location(module_name, main_file)
+    if not spec or not spec.loader:
+        raise exceptions.PluginLoadError(plugin_name, "Failed to create module spec")
+
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    if not hasattr(module, constants.PLUGIN_CLASS_NAME):
+        raise exceptions.PluginLoadError(
+            plugin_name, f"No '{constants.PLUGIN_CLASS_NAME}' class found"
+        )
+    return getattr(module, constants.PLUGIN_CLASS_NAME)
+
+
+def _read_plugin_settings(plugin_dir: Path) -> Dict[str, Any]:
+    """Parse a plugin's settings.json, or return {} if it has none."""
+    try:
+        return utils.loads((plugin_dir / constants.PLUGIN_SETTINGS_FILE).read_bytes())
+    except FileNotFoundError:
+        return {}
+
+
+def _overrides_hook(plugin: Any, hook: str) -> bool:
+    """Whether ``plugin`` implements ``hook`` rather than inheriting PluginBase's no-op."""
+    method = getattr(plugin, hook, None)
+    return method is not None and (
+        getattr(method, "__func__", None) is not getattr(PluginBase, hook)
+    )
 
 
 class VaultBrain:
@@ -50,6 +88,8 @@ class VaultBrain:
     """
 
     _instance: Optional["VaultBrain"] = None
+    # Shadowed by the instance attribute once __init__ has run
+    _initialized: bool = False
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
@@ -70,13 +110,18 @@ class VaultBrain:
         Note: Heavy initialization happens in self.initialize()
         """
         # Prevent re-initialization if already initialized
-        if hasattr(self, "_initialized") and self._initialized:
+        if self._initialized:
             return
 
         self.vault_path = utils.validate_vault_path(vault_path)
 
         self.plugins: Dict[str, Any] = {}
         self.commands: Dict[str, Dict[str, Any]] = {}
+        # plugin name -> bound on_client_connected, for plugins that implement it
+        self._client_connected_hooks: Dict[str, EventHandler] = {}
+
+        # Turns (module_name, main.py path) into a Plugin class; swappable in tests
+        self._plugin_loader: PluginLoader = _import_plugin_class
 
         # Internal Event Bus
         self.events = EventBus()
@@ -94,6 +139,15 @@ class VaultBrain:
         # Plugin Installer
         self.plugin_installer = PluginInstaller(self.vault_path)
 
+        # Ids for trigger_event notifications; they only need to be unique
+        # within this process, so a counter replaces timestamp + random hex
+        self._event_ids = itertools.count(1)
+        # persist=True events emitted while no client was connected, replayed
+        # on system.client_ready; the oldest are dropped once full
+        self._persisted_events: Deque[Dict[str, Any]] = deque(
+            maxlen=constants.MAX_PERSISTED_EVENTS
+        )
+
         # Active stream tracking for cancellation
         self._active_streams: Dict[str, bool] = {}  # stream_id -> should_cancel
 
@@ -175,7 +229,7 @@ class VaultBrain:
         # - CoreEvents.FILE_DELETED
 
         # Load Plugins (Phase 1: Discovery & Registration)
-        self._load_plugins()
+        await self._load_plugins()
 
         logger.info(
             f"VaultBrain configured: {len(self.plugins)} plugins, "
@@ -227,11 +281,14 @@ class VaultBrain:
     # Plugin Lifecycle
     # =========================================================================
 
-    def _load_plugins(self) -> None:
+    async def _load_plugins(self) -> None:
         """
         Phase 1: Loading & Registration.
         Instantiates plugins and calls register_commands().
         Side-effect free (no active code execution).
+
+        Plugin modules are imported concurrently on worker threads; plugins
+        are then instantiated and registered in name order on the loop.
         """
         plugins_dir = utils.get_plugins_dir(self.vault_path)
 
@@ -241,36 +298,23 @@ class VaultBrain:
 
         logger.debug(f"Scanning plugins directory: {plugins_dir}")
 
-        plugin_dirs = []
-        for item in plugins_dir.iterdir():
-            if item.is_file():
-                continue
-            if item.name.startswith((".", "_")):
-                continue
-
-            main_file = item / constants.PLUGIN_MAIN_FILE
-            if main_file.exists():
-                plugin_dirs.append(item)
-
-        plugin_dirs = sorted(plugin_dirs, key=lambda p: p.name)
+        plugin_dirs = utils.discover_plugins(plugins_dir)
 
         if not plugin_dirs:
             logger.info("No plugins found in vault")
             return
 
-        loaded_count = 0
+        enabled = []
         for plugin_dir in plugin_dirs:
             plugin_name = plugin_dir.name
             # 1. Load defaults from settings.json (if exists)
             defaults = {}
-            settings_path = plugin_dir / "settings.json"
-            if settings_path.exists():
-                try:
-                    defaults = json.loads(settings_path.read_text(encoding="utf-8"))
-                except Exception as e:
-                    logger.error(
-                        f"Failed to load settings.json for plugin '{plugin_name}': {e}"
-                    )
+            try:
+                defaults = _read_plugin_settings(plugin_dir)
+            except Exception as e:
+                logger.error(
+                    f"Failed to load settings.json for plugin '{plugin_name}': {e}"
+                )
 
             # 2. Get Overrides from .vault.toml (Global Config)
             # Structure: { "plugins": { "plugin_name": { "enabled": true, "param": 123 } } }
@@ -297,28 +341,21 @@ class VaultBrain:
                 logger.debug(f"Plugin '{plugin_name}' is disabled, skipping")
                 continue
 
-            try:
-                utils.validate_plugin_structure(plugin_dir)
-
-                # Load module
-                main_file = plugin_dir / "main.py"
-                spec = importlib.util.spec_from_file_location(plugin_name, main_file)
-                if not spec or not spec.loader:
-                    raise exceptions.PluginLoadError(
-                        plugin_name, "Failed to create module spec"
-                    )
+            enabled.append((plugin_dir, final_config))
 
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
+        # Import every enabled plugin at once; the default executor bounds the threads
+        plugin_classes = await asyncio.gather(
+            *(self._import_plugin(plugin_dir) for plugin_dir, _ in enabled),
+            return_exceptions=True,
+        )
 
-                if not hasattr(module, constants.PLUGIN_CLASS_NAME):
-                    raise exceptions.PluginLoadError(
-                        plugin_name, f"No '{constants.PLUGIN_CLASS_NAME}' class found"
-                    )
+        for (plugin_dir, final_config), plugin_class in zip(enabled, plugin_classes):
+            plugin_name = plugin_dir.name
+            try:
+                if isinstance(plugin_class, BaseException):
+                    raise plugin_class
 
                 # Instantiate (Fresh Init, no args passed mostly)
-                plugin_class = getattr(module, constants.PLUGIN_CLASS_NAME)
-
                 # Pass resolved config to plugin
                 plugin = plugin_class(
                     plugin_dir=plugin_dir,
@@ -345,19 +382,20 @@ class VaultBrain:
         Calls on_load() for all plugins.
         """
         logger.info("Activating plugins (calling on_load)...")
-        for plugin_name, plugin in self.plugins.items():
+        plugins = list(self.plugins.items())
+        # on_load hooks run concurrently, so one plugin waiting on I/O doesn't
+        # hold up the rest
+        results = await asyncio.gather(
+            *(plugin.on_load() for _, plugin in plugins), return_exceptions=True
+        )
+
+        # Hooks and announcements follow plugin order, as before
+        for (plugin_name, plugin), result in zip(plugins, results):
             try:
-                await plugin.on_load()
-
-                # Auto-subscribe to TICK if plugin overrides on_tick
-                # We check if the method is different from the base class implementation
-                # This is a bit tricky since PluginBase is abstract, but we can check if it's callable
-                # A safer way is checking if it's NOT the base implementation, but base is abstract pass?
-                # Actually, PluginBase.on_tick is defined as 'pass'.
-                # Let's just subscribe it. If it does nothing, it does nothing.
-                # Optimization: Check if plugin.on_tick code object is different from PluginBase.on_tick code object?
-                # For now, just subscribe. The event system handles errors.
-                self.subscribe(constants.CoreEvents.TICK, plugin.on_tick)
+                if isinstance(result, BaseException):
+                    raise result
+
+                self._register_plugin_hooks(plugin_name, plugin)
 
                 # Announce plugin loaded
                 await self.publish(
@@ -366,6 +404,25 @@ class VaultBrain:
             except Exception as e:
                 logger.exception(f"Error activating plugin '{plugin_name}': {e}")
 
+    async def _import_plugin(self, plugin_dir: Path) -> type:
+        """Validate a plugin directory and import its Plugin class off the event loop."""
+        utils.validate_plugin_structure(plugin_dir)
+        return await asyncio.to_thread(
+            self._plugin_loader, plugin_dir.name, plugin_dir / constants.PLUGIN_MAIN_FILE
+        )
+
+    def _register_plugin_hooks(self, plugin_name: str, plugin: Any) -> None:
+        """
+        Wire up the lifecycle hooks a plugin actually implements.
+
+        Hooks left as PluginBase's no-op are skipped, so ticks and client
+        connects only await plugins with something to do.
+        """
+        if _overrides_hook(plugin, "on_tick"):
+            self.subscribe(constants.CoreEvents.TICK, plugin.on_tick)
+        if _overrides_hook(plugin, "on_client_connected"):
+            self._client_connected_hooks[plugin_name] = plugin.on_client_connected
+
     # =========================================================================
     # Command Registry
     # =========================================================================
@@ -378,7 +435,7 @@ class VaultBrain:
         override: bool = False,
     ) -> None:
         """Register a command."""
-        if not inspect.iscoroutinefunction(handler):
+        if not utils.is_async_callable(handler):
             raise exceptions.CommandRegistrationError(
                 command_id, "Handler must be an async function"
             )
@@ -411,20 +468,14 @@ class VaultBrain:
         """
         Execute a registered command.
 
-        Commands can be registered via:
-        1. brain.register_command() - stored in self.commands
-        2. ws_server.register_handler() - stored in ws_server.command_handlers
-
-        This method checks both locations for backward compatibility.
+        Commands are registered via brain.register_command() and stored in
+        self.commands.
         """
-        handler = None
-
-        if command_id in self.commands:
-            handler = self.commands[command_id]["handler"]
-
-        if handler is None:
-            all_commands = list(self.commands.keys())
-            raise exceptions.CommandNotFoundError(command_id, all_commands)
+        # One lookup on the hot path; the id list is only built for the error
+        entry = self.commands.get(command_id)
+        if entry is None:
+            raise exceptions.CommandNotFoundError(command_id, list(self.commands))
+        handler = entry["handler"]
 
         try:
             result = await handler(**kwargs)
@@ -446,11 +497,18 @@ class VaultBrain:
     @command("system.client_ready", constants.CORE_PLUGIN_NAME)
     async def _client_ready_handler(self, **kwargs):
         """Handle client ready signal."""
+        # Without a server there is nowhere to replay to; events stay queued
+        send = self._send_to_rust
+        if self._persisted_events and send is not None:
+            logger.debug(f"Replaying {len(self._persisted_events)} persisted events")
+            while self._persisted_events:
+                send(self._persisted_events.popleft())
+
         logger.info("Client ready signal received. Triggering plugin hooks...")
-        # Trigger on_client_connected for all plugins
-        for name, plugin in self.plugins.items():
+        # Trigger on_client_connected for the plugins that implement it
+        for name, hook in list(self._client_connected_hooks.items()):
             try:
-                await plugin.on_client_connected()
+                await hook()
             except Exception as e:
                 logger.error(f"Error in {name}.on_client_connected: {e}")
         return {"status": "ok"}
@@ -1129,6 +1187,7 @@ class VaultBrain:
                             
             # 4. Remove from plugins dict
             del self.plugins[plugin_id]
+            self._client_connected_hooks.pop(plugin_id, None)
             
             logger.info(f"Unloaded plugin: {plugin_id}")
             return {"status": "success", "message": f"Plugin {plugin_id} unloaded"}
@@ -1168,12 +1227,10 @@ class VaultBrain:
                 
             # Load defaults
             defaults = {}
-            settings_path = plugin_dir / "settings.json"
-            if settings_path.exists():
-                try:
-                    defaults = json.loads(settings_path.read_text(encoding="utf-8"))
-                except Exception as e:
-                    pass
+            try:
+                defaults = _read_plugin_settings(plugin_dir)
+            except Exception as e:
+                pass
                     
             final_config = defaults.copy()
             final_config.update(overrides)
@@ -1186,17 +1243,9 @@ class VaultBrain:
             importlib.invalidate_caches() # ensure we don't load stale cache
             
             main_file = plugin_dir / "main.py"
-            spec = importlib.util.spec_from_file_location(f"{plugin_id}_{int(time.time())}", main_file)
-            if not spec or not spec.loader:
-                return {"status": "error", "error": "Failed to create module spec"}
-
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-
-            if not hasattr(module, constants.PLUGIN_CLASS_NAME):
-                 return {"status": "error", "error": f"No Plugin class found"}
-
-            plugin_class = getattr(module, constants.PLUGIN_CLASS_NAME)
+            plugin_class = self._plugin_loader(
+                f"{plugin_id}_{int(time.time())}", main_file
+            )
             plugin = plugin_class(
                 plugin_dir=plugin_dir,
                 vault_path=self.vault_path,
@@ -1212,7 +1261,7 @@ class VaultBrain:
             
             # 6. Activate Phase
             await plugin.on_load()
-            self.subscribe(constants.CoreEvents.TICK, plugin.on_tick)
+            self._register_plugin_hooks(plugin_id, plugin)
             await self.publish(constants.CoreEvents.PLUGIN_LOADED, plugin_name=plugin_id)
             
             logger.info(f"Successfully reloaded plugin '{plugin_id}'")
@@ -1242,6 +1291,7 @@ class VaultBrain:
 
             # 3. Clear plugin state
             self.plugins.clear()
+            self._client_connected_hooks.clear()
             self.commands.clear()
             self.events = EventBus()
 
@@ -1249,7 +1299,7 @@ class VaultBrain:
             self.config = self._load_config()
 
             # 5. Reload plugins
-            self._load_plugins()
+            await self._load_plugins()
 
             # 6. Activate plugins
             await self._activate_plugins()
@@ -1271,10 +1321,24 @@ class VaultBrain:
             logger.exception(f"Vault restart failed: {e}")
             return {"status": "error", "error": str(e)}
 
+    @property
+    def ws_server(self) -> Any:
+        """WebSocket server used to reach the frontend."""
+        return self._ws_server
+
+    @ws_server.setter
+    def ws_server(self, ws_server: Any) -> None:
+        # Bind the methods emit_to_frontend calls once per server rather than
+        # resolving them through ws_server on every event
+        self._ws_server = ws_server
+        self._send_to_rust = ws_server.send_to_rust if ws_server else None
+        self._ws_is_connected = ws_server.is_connected if ws_server else None
+
     @property
     def is_client_connected(self) -> bool:
         """Check if frontend client is connected."""
-        return self.ws_server and self.ws_server.is_connected()
+        is_connected = self._ws_is_connected
+        return is_connected is not None and is_connected()
 
     # =========================================================================
 
@@ -1300,11 +1364,18 @@ class VaultBrain:
         event_type: str,
         data: Dict[str, Any],
         scope: str = constants.EventScope.WINDOW,
+        persist: bool = False,
     ) -> None:
         """
         Send a raw event to the Frontend via WebSocket.
+
+        Without a connected client the event is dropped before its message is
+        built, unless ``persist`` is set: then it is kept (up to
+        MAX_PERSISTED_EVENTS) and sent once the client reports ready.
         """
-        if not self.is_client_connected:
+        is_connected = self._ws_is_connected
+        connected = is_connected is not None and is_connected()
+        if not connected and not persist:
             logger.debug(f"Skipping '{event_type}': Client not connected")
             return
 
@@ -1317,9 +1388,12 @@ class VaultBrain:
                 "data": data,
                 "timestamp": time.time(),
             },
-            request_id=utils.generate_id("evt_"),
+            request_id=f"evt_{next(self._event_ids)}",
         )
-        self.ws_server.send_to_rust(msg)
+        if connected:
+            self._send_to_rust(msg)
+        else:
+            self._persisted_events.append(msg)
 
     # =========================================================================
     # Config & Utils
@@ -1328,12 +1402,13 @@ class VaultBrain:
     def _load_config(self) -> Dict[str, Any]:
         """Load .vault.toml."""
         config_file = utils.get_vault_config_path(self.vault_path)
-        if config_file.exists():
-            try:
-                with open(config_file, "rb") as f:
-                    return tomllib.load(f)
-            except Exception as e:
-                logger.error(f"Config load error: {e}")
+        try:
+            # One read, no exists() stat; tomllib.load decodes the same way
+            return tomllib.loads(config_file.read_bytes().decode("utf-8"))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Config load error: {e}")
 
         default = constants.DEFAULT_VAULT_CONFIG.copy()
         default["id"] = str(self.vault_path)
@@ -1342,8 +1417,20 @@ class VaultBrain:
 
     async def tick_loop(self) -> None:
         logger.info("Starting tick loop...")
+        interval = constants.DEFAULT_TICK_INTERVAL
+        # Ticks are scheduled against monotonic deadlines, so time spent in
+        # TICK handlers doesn't push every later tick back
+        deadline = _monotonic()
         while True:
-            await asyncio.sleep(constants.DEFAULT_TICK_INTERVAL)
+            deadline += interval
+            delay = deadline - _monotonic()
+            if delay > 0:
+                await _sleep(delay)
+            elif delay < -interval:
+                # More than a whole interval behind: drop the missed ticks
+                # instead of firing them back to back
+                logger.warning(f"Tick loop {-delay:.1f}s behind, skipping missed ticks")
+                deadline = _monotonic()
             await self.publish(constants.CoreEvents.TICK)
 
     # Removed explicit _tick_plugins iteration
@@ -7,7 +7,8 @@ manages command/event exchange using JSON-RPC 2.0 protocol.
 
 import asyncio
 import json
-from typing import Optional, Dict, Any, Callable, Awaitable
+from collections import deque
+from typing import Deque, Optional, Dict, Any, Callable, Awaitable
 import websockets
 from websockets.exceptions import ConnectionClosed
 from loguru import logger
@@ -21,6 +22,12 @@ CommandHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
 
 logger = logger.bind(name=__name__)
 
+_JSONRPC_VERSION = constants.JSONRPC_VERSION
+# Shared default for requests without params; handlers receive it as **kwargs,
+# so it is never mutated
+_NO_PARAMS: Dict[str, Any] = {}
+_PARAMS_TYPES = (dict, list)
+
 
 class WebSocketServer:
     """
@@ -48,9 +55,16 @@ class WebSocketServer:
         self.host = host
         self.connection: Optional[Any] = None
         self.message_queue: asyncio.Queue = asyncio.Queue()
-        self.pending_messages: list[Dict[str, Any]] = []
+        # Messages sent while no client is connected, handed to the next
+        # connection's writer; bounded so a long wait can't grow it forever
+        self.pending_messages: Deque[Dict[str, Any]] = deque(
+            maxlen=constants.WEBSOCKET_MAX_PENDING_MESSAGES
+        )
         self.brain = None  # Will be set by VaultBrain after initialization
 
+        # Outbound messages for the active connection, drained by _writer()
+        self._out_queue: Optional[asyncio.Queue] = None
+
         logger.info(f"WebSocket server initialized on {host}:{port}")
 
     async def start(self) -> None:
@@ -69,13 +83,6 @@ class WebSocketServer:
         ):
             logger.info(f"WebSocket server listening on ws://{self.host}:{self.port}")
 
-            # Send any pending messages that were queued before server started
-            if self.pending_messages and self.connection:
-                logger.debug(f"Sending {len(self.pending_messages)} pending messages")
-                for msg in self.pending_messages:
-                    await self.send(msg)
-                self.pending_messages.clear()
-
             # Run forever
             await asyncio.Future()
 
@@ -89,6 +96,15 @@ class WebSocketServer:
         client_addr = websocket.remote_address
         logger.info(f"Client connected from {client_addr}")
         self.connection = websocket
+        queue: asyncio.Queue = asyncio.Queue(
+            maxsize=constants.WEBSOCKET_MAX_PENDING_MESSAGES
+        )
+        # Hand over anything send_to_rust() queued while no client was connected
+        for msg in self.pending_messages:
+            queue.put_nowait(msg)
+        self.pending_messages.clear()
+        writer = asyncio.create_task(self._writer(websocket, queue))
+        self._out_queue = queue
 
         try:
             async for message in websocket:
@@ -101,9 +117,66 @@ class WebSocketServer:
             logger.exception(f"WebSocket error: {e}")
 
         finally:
+            writer.cancel()
+            if self._out_queue is queue:
+                self._out_queue = None
+            # Undelivered messages wait for the next connection
+            self._return_to_pending(queue)
             self.connection = None
             logger.debug("Connection closed")
 
+    async def _writer(self, websocket: Any, queue: asyncio.Queue) -> None:
+        """
+        Send queued messages to the client, coalescing bursts.
+
+        Whatever is already queued when a message is picked up (up to
+        WEBSOCKET_SEND_BATCH_SIZE) goes out as one JSON array frame, so a
+        burst of notifications costs one frame instead of one per message.
+        A lone message is sent as a plain object.
+
+        Args:
+            websocket: Connection to write to
+            queue: Outbound queue for that connection
+        """
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < constants.WEBSOCKET_SEND_BATCH_SIZE:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            try:
+                await websocket.send(
+                    utils.dumps(batch[0] if len(batch) == 1 else batch)
+                )
+                logger.debug(f"Sent {len(batch)} message(s)")
+            except Exception as e:
+                logger.exception(f"Send error: {e}")
+                # Stop accepting messages for this connection and keep the
+                # unsent ones for the next
+                if self._out_queue is queue:
+                    self._out_queue = None
+                self.pending_messages.extend(batch)
+                self._return_to_pending(queue)
+                self.close()
+                return
+
+    def _return_to_pending(self, queue: asyncio.Queue) -> None:
+        """Move whatever is left in a connection's queue to pending_messages."""
+        while not queue.empty():
+            self.pending_messages.append(queue.get_nowait())
+
+    @staticmethod
+    def _enqueue(queue: asyncio.Queue, data: Dict[str, Any]) -> None:
+        """Queue a message for the writer, dropping the oldest when full."""
+        if queue.full():
+            logger.warning(
+                f"{queue.maxsize} messages waiting to be sent, dropping the oldest"
+            )
+            queue.get_nowait()
+        queue.put_nowait(data)
+
     async def handle_message(self, message: str) -> None:
         """
         Handle incoming message from Rust.
@@ -119,24 +192,33 @@ class WebSocketServer:
         try:
             # Parse JSON
             try:
-                data = json.loads(message)
+                data = utils.loads(message)
             except json.JSONDecodeError as e:
                 logger.error(f"Invalid JSON: {message[:100]}")
                 raise exceptions.WebSocketMessageError(
                     message, f"JSON parse error: {e}"
                 )
 
-            # Validate JSON-RPC structure
-            try:
-                utils.validate_jsonrpc_message(data)
-            except exceptions.JSONRPCError as e:
-                logger.error(f"Invalid JSON-RPC message: {e.message}")
-                raise
-
-            # Extract message components
-            request_id = utils.get_request_id(data)
-            method = utils.get_method(data)
-            params = utils.get_params(data)
+            # Fast path: a well-formed request is validated inline, reading each
+            # field once and keeping it for dispatch. Anything else goes
+            # through the full validator to get its specific error.
+            if (
+                type(data) is dict
+                and data.get("jsonrpc") == _JSONRPC_VERSION
+                and type(method := data.get("method")) is str
+                and type(params := data.get("params", _NO_PARAMS)) in _PARAMS_TYPES
+            ):
+                request_id = data.get("id")
+                if type(params) is list:
+                    params = {"args": params}
+            else:
+                try:
+                    utils.validate_jsonrpc_message(data)
+                except exceptions.JSONRPCError as e:
+                    logger.error(f"Invalid JSON-RPC message: {e.message}")
+                    raise
+                # Valid but not a request, i.e. a response
+                method = None
 
             if not method:
                 logger.error(f"Message missing method: {data}")
@@ -203,12 +285,17 @@ class WebSocketServer:
         """
         Send message to Rust.
 
+        Queued for the connection's writer when one is running; otherwise
+        written directly.
+
         Args:
             data: Message data (will be JSON encoded)
         """
-        if self.is_connected():
+        if self._out_queue is not None:
+            self._enqueue(self._out_queue, data)
+        elif self.is_connected():
             try:
-                await self.connection.send(json.dumps(data))
+                await self.connection.send(utils.dumps(data))
                 logger.debug(f"Sent message: {data.get('method', 'response')}")
             except Exception as e:
                 logger.exception(f"Send error: {e}")
@@ -238,21 +325,29 @@ class WebSocketServer:
         Send data to Rust (safe to call from sync or async context).
 
         This method can be called from synchronous code (e.g., plugins).
-        It will queue the message to be sent when the event loop is available.
+        The message goes straight onto the connection's writer queue, so no
+        task is created per message; without a connection it is kept until
+        the next client connects, up to WEBSOCKET_MAX_PENDING_MESSAGES (the
+        oldest are dropped beyond that).
 
         Args:
             data: Dictionary to send as JSON-RPC message
         """
-        # Try to create task if event loop is running
-        try:
-            loop = asyncio.get_running_loop()
-            asyncio.create_task(self.send(data))
-        except RuntimeError:
-            # No running loop yet - queue message to send when connected
+        if self._out_queue is not None:
+            self._enqueue(self._out_queue, data)
+            return
+
+        pending = self.pending_messages
+        if len(pending) == pending.maxlen:
+            logger.warning(
+                f"No connection and {pending.maxlen} messages pending, "
+                "dropping the oldest"
+            )
+        else:
             logger.debug(
-                f"Queuing message (no event loop): {data.get('method', 'unknown')}"
+                f"Queuing message (no connection): {data.get('method', 'unknown')}"
             )
-            self.pending_messages.append(data)
+        pending.append(data)
 
     def is_connected(self) -> bool:
         """
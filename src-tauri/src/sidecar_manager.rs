@@ -255,9 +255,16 @@ impl SidecarManager {
                 Message::Text(text) => {
                     let response: serde_json::Value = serde_json::from_str(&text)
                         .context("Failed to parse sidecar response")?;
-                    
-                    if response.get("id").and_then(|id| id.as_str()) == Some(&request_id) {
-                         return Ok(response);
+
+                    // The sidecar may coalesce several messages into one JSON array frame
+                    let messages = match response {
+                        serde_json::Value::Array(items) => items,
+                        single => vec![single],
+                    };
+                    for response in messages {
+                        if response.get("id").and_then(|id| id.as_str()) == Some(&request_id) {
+                            return Ok(response);
+                        }
                     }
                 }
                 Message::Close(_) => break,
@@ -5,6 +5,7 @@ import { connect, request, autoConnect } from '../vault/connection.js';
 class MockWebSocket {
     constructor(url) {
         this.url = url;
+        MockWebSocket.last = this;
         this.readyState = WebSocket.CONNECTING;
         setTimeout(() => {
             this.readyState = WebSocket.OPEN;
@@ -70,6 +71,28 @@ describe('Connection Module', () => {
         expect(result).toEqual({ jsonrpc: '2.0', result: 'success', id: expect.any(Number) });
     });
 
+    it('dispatches every message in an array frame', async () => {
+        const handleEvent = vi.fn();
+        connect('9002', vi.fn(), handleEvent);
+        vi.runAllTimers(); // Wait for open
+
+        const socket = MockWebSocket.last;
+        socket.send = vi.fn(); // Answer below instead of echoing
+        const promise = request('test.method');
+        const { id } = JSON.parse(socket.send.mock.calls[0][0]);
+
+        // The sidecar coalesces a response and an event into one frame
+        socket.onmessage({
+            data: JSON.stringify([
+                { jsonrpc: '2.0', result: 'ok', id },
+                { jsonrpc: '2.0', method: 'trigger_event', params: { event_type: 'NOTIFY' }, id: 'evt_1' }
+            ])
+        });
+
+        expect(await promise).toEqual({ jsonrpc: '2.0', result: 'ok', id });
+        expect(handleEvent).toHaveBeenCalledWith({ event_type: 'NOTIFY' });
+    });
+
     it('handles autoConnect via URL param', async () => {
         global.window.location.search = '?port=1234';
         await autoConnect();
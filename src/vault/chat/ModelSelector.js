@@ -72,8 +72,9 @@ export class ModelSelector {
             const originalOnMessage = window.ws.onmessage;
             window.ws.onmessage = (event) => {
                 try {
-                    const data = JSON.parse(event.data);
-                    if (data.event === 'settings.model_category_changed') {
+                    const payload = JSON.parse(event.data);
+                    const messages = Array.isArray(payload) ? payload : [payload];
+                    if (messages.some(data => data.event === 'settings.model_category_changed')) {
                         this.refresh();
                     }
                 } catch (e) { }
@@ -67,12 +67,15 @@ export function connect(explicitPort, loadPluginsFn, handleEventFn) {
 
     ws.onmessage = (e) => {
         try {
-            const data = JSON.parse(e.data);
-            if (data.method === 'trigger_event') {
-                if (handleEventFn) handleEventFn(data.params);
-            } else if (data.id && pending.has(data.id)) {
-                pending.get(data.id)(data);
-                pending.delete(data.id);
+            // The sidecar coalesces bursts into a single JSON array frame
+            const payload = JSON.parse(e.data);
+            for (const data of Array.isArray(payload) ? payload : [payload]) {
+                if (data.method === 'trigger_event') {
+                    if (handleEventFn) handleEventFn(data.params);
+                } else if (data.id && pending.has(data.id)) {
+                    pending.get(data.id)(data);
+                    pending.delete(data.id);
+                }
             }
         } catch (err) {
             log(`Parse Error: ${err}`, 'error');